@@ -0,0 +1,129 @@
+""" Compact record of a player's account balance over time. """
+
+from array import array
+
+# Marks an entry of _deltas whose value is kept in _large_deltas
+_LARGE_DELTA = -2 ** 31
+_MAX_DELTA = 2 ** 31 - 1
+
+
+class BalanceHistory:
+    """ Represents the balance of one player after each turn.
+
+    Balances are stored as changes from the previous turn in an array('i'),
+    with the full balance kept every keyframe_interval turns so any turn can
+    be rebuilt without replaying the whole game. With delta_of_delta, the
+    change in the change is stored instead, which is 0 for turns where the
+    balance moves the same way as the turn before. Values that do not fit
+    in 32 bits are kept in a dict instead, so balances are not limited.
+
+    Attributes:
+        _keyframe_interval (int): turns between stored full balances
+        _delta_of_delta (bool): store second differences instead of deltas
+        _keyframes (list): full balance at each keyframe turn
+        _keyframe_deltas (list): balance change at each keyframe turn
+        _deltas (array): encoded change for every turn; 0 at keyframes
+        _large_deltas (dict): turn: encoded change too large for _deltas
+        _last_balance (int): most recently appended balance
+        _last_delta (int): most recent balance change
+    """
+
+    def __init__(self, keyframe_interval=256, delta_of_delta=False):
+        self._keyframe_interval = keyframe_interval
+        self._delta_of_delta = delta_of_delta
+        self._keyframes = []
+        self._keyframe_deltas = []
+        self._deltas = array("i")
+        self._large_deltas = {}
+        self._last_balance = 0
+        self._last_delta = 0
+
+    def __len__(self):
+        return len(self._deltas)
+
+    def __getitem__(self, turn):
+        """ Rebuild the balance at a turn.
+
+        Args:
+            turn (int): turn index; negative values count from the end
+        Returns:
+            int: account balance after turn
+        Raises:
+            IndexError: if turn is out of range
+        """
+        if turn < 0:
+            turn += len(self._deltas)
+        if not 0 <= turn < len(self._deltas):
+            raise IndexError("turn out of range")
+
+        keyframe_index = turn // self._keyframe_interval
+        keyframe_turn = keyframe_index * self._keyframe_interval
+        balance = self._keyframes[keyframe_index]
+
+        if not self._delta_of_delta:
+            balance += sum(self._deltas[keyframe_turn + 1:turn + 1])
+            for large_turn, value in self._large_deltas.items():
+                if keyframe_turn < large_turn <= turn:
+                    balance += value - _LARGE_DELTA
+            return balance
+
+        delta = self._keyframe_deltas[keyframe_index]
+        for index in range(keyframe_turn + 1, turn + 1):
+            delta += self.get_delta(index)
+            balance += delta
+        return balance
+
+    def __iter__(self):
+        balance = 0
+        delta = 0
+        for turn, value in enumerate(self._deltas):
+            if turn % self._keyframe_interval == 0:
+                keyframe_index = turn // self._keyframe_interval
+                balance = self._keyframes[keyframe_index]
+                delta = self._keyframe_deltas[keyframe_index]
+            else:
+                if value == _LARGE_DELTA:
+                    value = self._large_deltas[turn]
+                if self._delta_of_delta:
+                    delta += value
+                    balance += delta
+                else:
+                    balance += value
+            yield balance
+
+    def get_delta(self, turn):
+        """ Helper method for __getitem__. Return the encoded change stored
+        for a turn.
+
+        Args:
+            turn (int): turn index
+        Returns:
+            int: change, or change in the change with delta_of_delta
+        """
+        value = self._deltas[turn]
+        if value == _LARGE_DELTA:
+            return self._large_deltas[turn]
+        return value
+
+    def append(self, balance):
+        """ Record the balance for the next turn.
+
+        Args:
+            balance (int): account balance after turn
+        """
+        delta = balance - self._last_balance if self._deltas else 0
+
+        if len(self._deltas) % self._keyframe_interval == 0:
+            self._keyframes.append(balance)
+            self._keyframe_deltas.append(delta)
+            self._deltas.append(0)
+        else:
+            value = delta - self._last_delta if self._delta_of_delta else delta
+            if _LARGE_DELTA < value <= _MAX_DELTA:
+                self._deltas.append(value)
+            else:
+                self._large_deltas[len(self._deltas)] = value
+                self._deltas.append(_LARGE_DELTA)
+
+        self._last_balance = balance
+        self._last_delta = delta
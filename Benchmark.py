@@ -0,0 +1,181 @@
+""" Benchmarks for RealEstateGame and its supporting modules.
+
+Run with: python Benchmark.py
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from EarlyTermination import DominanceCriterion, OutcomeModelCriterion, fit_outcome_model
+from GameStore import GameStore
+from RealEstateEnv import RealEstateEnv
+from RealEstateGame import RealEstateGame
+from Simulation import new_game as new_simulation_game, play_game
+
+RENT_LIST = [50, 50, 50, 100, 100, 100, 150, 150, 150, 200, 200, 200,
+             250, 250, 250, 300, 300, 300, 350, 350, 350, 400, 400, 400]
+PLAYER_NAMES = ["Sandra", "Maria", "Sue", "Sam"]
+
+
+def new_game(use_move_table=True, initial_balance=1000):
+    """ Create a four player game with the standard benchmark board.
+
+    Args:
+        use_move_table (bool): resolve moves from the precomputed move table
+        initial_balance (int): account balance of each player
+    Returns:
+        RealEstateGame: new game
+    """
+    game = RealEstateGame(use_move_table)
+    game.create_spaces(100, RENT_LIST)
+    for name in PLAYER_NAMES:
+        game.create_player(name, initial_balance)
+    return game
+
+
+def benchmark_store_saves(num_games=200, num_turns=50, flush_interval=0.05):
+    """ Measure saves per second when many games are saved after every move.
+
+    Args:
+        num_games (int): number of concurrently running games
+        num_turns (int): moves made by each player in each game
+        flush_interval (float): GameStore flush interval in seconds
+    Returns:
+        float: saves per second
+    """
+    rng = random.Random(0)
+    games = {str(game_id): new_game() for game_id in range(num_games)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = GameStore(os.path.join(directory, "games.db"), flush_interval)
+        saves = 0
+        start = time.perf_counter()
+        for _ in range(num_turns):
+            for name in PLAYER_NAMES:
+                for game_id, game in games.items():
+                    game.move_player(name, rng.randint(1, 6))
+                    game.buy_space(name)
+                    store.save(game_id, game)
+                    saves += 1
+        store.close()
+        elapsed = time.perf_counter() - start
+
+    return saves / elapsed
+
+
+def benchmark_move_resolution(use_move_table, num_games=500, num_turns=100):
+    """ Measure moves per second with or without the move table.
+
+    Args:
+        use_move_table (bool): resolve moves from the precomputed move table
+        num_games (int): number of games played
+        num_turns (int): moves made by each player in each game
+    Returns:
+        float: moves per second
+    """
+    rng = random.Random(0)
+    rolls = [rng.randint(1, 6) + rng.randint(1, 6) for _ in range(num_turns * len(PLAYER_NAMES))]
+    # Large balances keep every player active for the whole run
+    games = [new_game(use_move_table, 10 ** 6) for _ in range(num_games)]
+
+    # Buy spaces in the first lap so most moves owe rent
+    for game in games:
+        for name in PLAYER_NAMES:
+            for _ in range(4):
+                game.move_player(name, rng.randint(1, 6))
+                game.buy_space(name)
+
+    start = time.perf_counter()
+    for game in games:
+        for index, roll in enumerate(rolls):
+            game.move_player(PLAYER_NAMES[index % 4], roll)
+    elapsed = time.perf_counter() - start
+
+    return num_games * len(rolls) / elapsed
+
+
+def benchmark_env_steps(num_envs=256, num_steps=200):
+    """ Measure RealEstateEnv environment steps per second with random actions.
+
+    Args:
+        num_envs (int): number of parallel games
+        num_steps (int): calls to step
+    Returns:
+        float: environment steps per second
+    """
+    rng = random.Random(0)
+    env = RealEstateEnv(num_envs)
+    env.reset()
+    actions = [[rng.randint(0, 1) for _ in range(num_envs)] for _ in range(num_steps)]
+
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    elapsed = time.perf_counter() - start
+
+    return num_envs * num_steps / elapsed
+
+
+def benchmark_early_termination(criterion, check_interval=20, num_games=200, seed=7,
+                                max_turns=2000):
+    """ Compare games played out in full with the same games ended early.
+    Both versions use the same dice, so they are identical up to the turn
+    the criterion ends the game.
+
+    Args:
+        criterion (callable): early termination criterion
+        check_interval (int): check_game_over calls between criterion checks
+        num_games (int): number of games played
+        seed (int): dice seed
+        max_turns (int): most turns played in each game
+    Returns:
+        dict: mean turns in full and with early termination, fraction of
+            games ended early, fraction with the same winner, and seconds
+            taken by each
+    """
+    full_turns = early_turns = ended_early = same_winner = 0
+    full_seconds = early_seconds = 0.0
+
+    for game_id in range(num_games):
+        start = time.perf_counter()
+        full_winner, turns = play_game(new_simulation_game(seed, game_id), max_turns)
+        full_seconds += time.perf_counter() - start
+        full_turns += turns
+
+        game = new_simulation_game(seed, game_id)
+        game.set_early_termination(criterion, check_interval)
+        start = time.perf_counter()
+        early_winner, turns = play_game(game, max_turns)
+        early_seconds += time.perf_counter() - start
+        early_turns += turns
+
+        ended_early += game.get_game_over_reason() == "early_termination"
+        same_winner += early_winner == full_winner
+
+    return {"full_turns": full_turns / num_games, "early_turns": early_turns / num_games,
+            "ended_early": ended_early / num_games, "accuracy": same_winner / num_games,
+            "full_seconds": full_seconds, "early_seconds": early_seconds}
+
+
+if __name__ == "__main__":
+    for use_table in (False, True):
+        print("move_player moves/sec (use_move_table={}): {:,.0f}".format(
+            use_table, benchmark_move_resolution(use_table)))
+
+    print("RealEstateEnv steps/sec: {:,.0f}".format(benchmark_env_steps()))
+
+    criteria = {"dominance 0.8": DominanceCriterion(),
+                "dominance 0.7": DominanceCriterion(0.7, 0.7),
+                "outcome model 0.98": OutcomeModelCriterion(fit_outcome_model(num_games=200))}
+    for label, criterion in criteria.items():
+        result = benchmark_early_termination(criterion)
+        print("Early termination ({}): turns/game {:.1f} -> {:.1f}, ended early {:.0%}, "
+              "winner accuracy {:.1%}, time {:.2f}s -> {:.2f}s".format(
+                  label, result["full_turns"], result["early_turns"], result["ended_early"],
+                  result["accuracy"], result["full_seconds"], result["early_seconds"]))
+
+    for interval in (0.0, 0.05, 1.0):
+        print("GameStore saves/sec (flush_interval={}): {:,.0f}".format(
+            interval, benchmark_store_saves(flush_interval=interval)))
@@ -0,0 +1,123 @@
+""" Reproducible dice for RealEstateGame.
+
+Rolls are drawn from a counter-based generator: the value of every roll
+depends only on (seed, game id, turn), never on how many rolls were made
+before it or in which process. Games can be simulated in any order on any
+number of workers and produce the same results.
+"""
+
+from array import array
+from hashlib import blake2b
+import struct
+
+# Each 64 byte digest yields sixteen 32 bit draws
+_DRAWS_PER_BLOCK = 16
+_BLOCK_FORMAT = "<16I"
+
+
+class Dice:
+    """ Represents the dice for a single game.
+
+    Attributes:
+        _seed (int): seed shared by every game in a simulation run
+        _game_id (str): unique game id
+        _num_dice (int): number of dice summed for each roll
+        _faces (int): number of faces on each die
+        _turn (int): turn of the next roll returned by next_roll
+        _block_index (int): index of the cached block of draws
+        _block (tuple): cached block of draws
+    """
+
+    def __init__(self, seed, game_id, num_dice=1, faces=6):
+        self._seed = seed
+        self._game_id = str(game_id)
+        self._num_dice = num_dice
+        self._faces = faces
+        self._turn = 0
+        self._block_index = -1
+        self._block = ()
+
+    def get_turn(self):
+        """ Return turn of the next roll returned by next_roll.
+
+        Returns:
+            int: turn counter
+        """
+        return self._turn
+
+    def set_turn(self, turn):
+        """ Set turn of the next roll returned by next_roll.
+
+        Args:
+            turn (int): turn counter
+        """
+        self._turn = turn
+
+    def get_block(self, block_index):
+        """ Helper method for roll. Return one block of raw draws.
+
+        Args:
+            block_index (int): index of block in the game's stream
+        Returns:
+            tuple: 32 bit unsigned draws
+        """
+        if block_index != self._block_index:
+            key = repr((self._seed, self._game_id, block_index)).encode()
+            digest = blake2b(key, digest_size=64).digest()
+            self._block = struct.unpack(_BLOCK_FORMAT, digest)
+            self._block_index = block_index
+        return self._block
+
+    def roll(self, turn):
+        """ Return the roll for a turn.
+
+        Args:
+            turn (int): turn number, starting at 0
+        Returns:
+            int: sum of the dice, num_dice to num_dice * faces
+        """
+        total = 0
+        first_draw = turn * self._num_dice
+        for draw_index in range(first_draw, first_draw + self._num_dice):
+            draw = self.get_block(draw_index // _DRAWS_PER_BLOCK)[draw_index % _DRAWS_PER_BLOCK]
+            # Scale 32 bit draw to a face
+            total += ((draw * self._faces) >> 32) + 1
+        return total
+
+    def next_roll(self):
+        """ Return the roll for the current turn and advance the turn.
+
+        Returns:
+            int: sum of the dice
+        """
+        result = self.roll(self._turn)
+        self._turn += 1
+        return result
+
+    def roll_buffer(self, start_turn, count):
+        """ Pre-generate rolls for consecutive turns.
+
+        Args:
+            start_turn (int): first turn in buffer
+            count (int): number of turns
+        Returns:
+            array: rolls as array('B'), identical to calling roll for each turn;
+                num_dice * faces must be at most 255
+        """
+        buffer = array("B", bytes(count))
+        num_dice = self._num_dice
+        faces = self._faces
+        draw_index = start_turn * num_dice
+        block = self.get_block(draw_index // _DRAWS_PER_BLOCK)
+
+        for index in range(count):
+            total = 0
+            for _ in range(num_dice):
+                offset = draw_index % _DRAWS_PER_BLOCK
+                if offset == 0:
+                    block = self.get_block(draw_index // _DRAWS_PER_BLOCK)
+                total += ((block[offset] * faces) >> 32) + 1
+                draw_index += 1
+            buffer[index] = total
+
+        return buffer
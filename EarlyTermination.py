@@ -0,0 +1,176 @@
+""" Criteria for ending a game once its winner is clear.
+
+Pass a criterion to RealEstateGame.set_early_termination. check_game_over
+calls it whenever more than one player is still active, and it returns the
+name of the player to declare winner, or an empty string to keep playing.
+"""
+
+import math
+
+from Simulation import new_game, play_game
+
+
+def net_worth(player):
+    """ Return a player's balance plus the purchase price of their spaces.
+
+    Args:
+        player (Player): player in game
+    Returns:
+        int: net worth
+    """
+    return player.get_account_balance() + sum(
+        space.get_purchase_price() for space in player.get_spaces_owned())
+
+
+def leader_features(game):
+    """ Describe how far the richest active player is ahead.
+
+    Args:
+        game (RealEstateGame): game with more than one active player
+    Returns:
+        tuple: (name of leader, [1, leader's share of total net worth,
+            leader's share of rent on owned spaces, 1 / active players])
+    """
+    active_players = [player for player in game.get_players()
+                      if player.get_account_balance() > 0]
+    worths = [net_worth(player) for player in active_players]
+    rents = [sum(space.get_rent_amount() for space in player.get_spaces_owned())
+             for player in active_players]
+
+    leader_index = max(range(len(active_players)), key=worths.__getitem__)
+    wealth_share = worths[leader_index] / sum(worths)
+    rent_share = rents[leader_index] / sum(rents) if sum(rents) else 0.0
+
+    return (active_players[leader_index].get_name(),
+            [1.0, wealth_share, rent_share, 1 / len(active_players)])
+
+
+class DominanceCriterion:
+    """ Represents a winner declared when the leader holds most of the wealth
+    and most of the rent income of the remaining players.
+
+    Attributes:
+        _wealth_share (float): smallest share of total net worth
+        _rent_share (float): smallest share of rent on owned spaces
+    """
+
+    def __init__(self, wealth_share=0.8, rent_share=0.8):
+        self._wealth_share = wealth_share
+        self._rent_share = rent_share
+
+    def __call__(self, game):
+        leader, features = leader_features(game)
+        if features[1] >= self._wealth_share and features[2] >= self._rent_share:
+            return leader
+        return ""
+
+
+class OutcomeModel:
+    """ Represents a logistic model of the chance the current leader wins.
+
+    Attributes:
+        _weights (list): one weight for each value of leader_features
+    """
+
+    def __init__(self, weights):
+        self._weights = list(weights)
+
+    def get_weights(self):
+        """ Return model weights.
+
+        Returns:
+            list: weights
+        """
+        return self._weights
+
+    def predict(self, features):
+        """ Return the probability that the leader wins.
+
+        Args:
+            features (list): features from leader_features
+        Returns:
+            float: probability between 0 and 1
+        """
+        score = sum(weight * value for weight, value in zip(self._weights, features))
+        return 1 / (1 + math.exp(-max(-50.0, min(50.0, score))))
+
+
+class OutcomeModelCriterion:
+    """ Represents a winner declared when an OutcomeModel is confident the
+    leader wins.
+
+    Attributes:
+        _model (OutcomeModel): fitted model
+        _threshold (float): smallest probability to declare a winner
+    """
+
+    def __init__(self, model, threshold=0.98):
+        self._model = model
+        self._threshold = threshold
+
+    def __call__(self, game):
+        leader, features = leader_features(game)
+        if self._model.predict(features) >= self._threshold:
+            return leader
+        return ""
+
+
+class _FeatureRecorder:
+    """ Represents a criterion that never ends the game but records the
+    leader and features every interval checks.
+
+    Attributes:
+        _interval (int): checks between samples
+        _checks (int): checks so far
+        samples (list): (name of leader, features) recorded
+    """
+
+    def __init__(self, interval):
+        self._interval = interval
+        self._checks = 0
+        self.samples = []
+
+    def __call__(self, game):
+        self._checks += 1
+        if self._checks % self._interval == 0:
+            self.samples.append(leader_features(game))
+        return ""
+
+
+def fit_outcome_model(num_games=300, seed=1, sample_interval=10, max_turns=2000,
+                      epochs=500, learning_rate=2.0, **game_options):
+    """ Fit an OutcomeModel to complete games.
+
+    Args:
+        num_games (int): games played to completion
+        seed (int): dice seed; use a different seed from the games predicted
+        sample_interval (int): turns between recorded samples
+        max_turns (int): most turns played; unfinished games are not used
+        epochs (int): gradient descent steps
+        learning_rate (float): gradient descent step size
+        **game_options: other arguments for Simulation.new_game
+    Returns:
+        OutcomeModel: fitted model
+    """
+    samples = []
+    for game_id in range(num_games):
+        recorder = _FeatureRecorder(sample_interval)
+        game = new_game(seed, game_id, **game_options)
+        game.set_early_termination(recorder)
+        winner, _ = play_game(game, max_turns)
+        if winner:
+            samples.extend((features, 1.0 if leader == winner else 0.0)
+                           for leader, features in recorder.samples)
+
+    model = OutcomeModel([0.0] * 4)
+    weights = model.get_weights()
+    for _ in range(epochs):
+        gradient = [0.0] * len(weights)
+        for features, label in samples:
+            error = model.predict(features) - label
+            for index, value in enumerate(features):
+                gradient[index] += error * value
+        for index in range(len(weights)):
+            weights[index] -= learning_rate * gradient[index] / max(len(samples), 1)
+
+    return model
@@ -0,0 +1,327 @@
+""" Differential fuzz testing of game engines against RealEstateGame.
+
+Random cases (board, players and a sequence of move_player, buy_space and
+check_game_over commands) are run on the reference RealEstateGame and on
+each candidate engine. After every command the return value, balances,
+positions and space owners must match. A divergence is shrunk to a
+minimal case and printed as a reproducer.
+
+Run with: python FuzzHarness.py --cases 2000
+"""
+
+import argparse
+import random
+import sys
+
+from RealEstateGame import MAX_TABLE_ROLL, RealEstateGame
+from SharedGamePool import SharedGamePool
+
+NUM_SPACES = 25
+
+
+def generate_case(rng, num_commands=100):
+    """ Generate a random case biased toward rule edge cases: balances equal
+    to purchase prices, rent larger than balance, and bankruptcy.
+
+    Args:
+        rng (Random): random source
+        num_commands (int): number of commands
+    Returns:
+        dict: money_amount, rent_amounts_list, balances and commands, where
+            each command is ("move", player, spaces), ("buy", player) or
+            ("check",)
+    """
+    rent_amounts_list = [rng.choice([10, 20, 50, 100, 200]) for _ in range(NUM_SPACES - 1)]
+    balances = []
+    for _ in range(rng.randint(2, 4)):
+        kind = rng.random()
+        if kind < 0.4:
+            # Equal to a purchase price
+            balances.append(rng.choice(rent_amounts_list) * 5)
+        elif kind < 0.7:
+            # Smaller than most rents
+            balances.append(rng.randint(1, 60))
+        else:
+            balances.append(rng.randint(1, 2000))
+
+    commands = []
+    while len(commands) < num_commands:
+        player = rng.randrange(len(balances))
+        kind = rng.random()
+        if kind < 0.6:
+            # Mostly dice rolls; sometimes moves past the move table
+            if rng.random() < 0.9:
+                spaces = rng.randint(0, MAX_TABLE_ROLL)
+            else:
+                spaces = rng.randint(0, NUM_SPACES)
+            commands.append(("move", player, spaces))
+            if rng.random() < 0.7:
+                commands.append(("buy", player))
+        elif kind < 0.9:
+            commands.append(("buy", player))
+        else:
+            commands.append(("check",))
+
+    return {"money_amount": rng.choice([0, 50, 100, 200]), "rent_amounts_list": rent_amounts_list,
+            "balances": balances, "commands": commands[:num_commands]}
+
+
+def player_name(player):
+    """ Return name used for a player index in generated cases.
+
+    Args:
+        player (int): player index
+    Returns:
+        str: player name
+    """
+    return "p{}".format(player)
+
+
+def setup_engine(engine, case):
+    """ Create a case's spaces and players on an engine.
+
+    Args:
+        engine: object with the RealEstateGame interface
+        case (dict): case from generate_case
+    Returns:
+        engine, ready for the case's commands
+    """
+    engine.create_spaces(case["money_amount"], case["rent_amounts_list"])
+    for player, balance in enumerate(case["balances"]):
+        engine.create_player(player_name(player), balance)
+    return engine
+
+
+def run_case(engine, case):
+    """ Run a case's commands and observe the engine after each one.
+
+    Args:
+        engine: engine prepared by setup_engine
+        case (dict): case from generate_case
+    Returns:
+        list: (return value, balances, positions, owners) after each command
+    """
+    names = [player_name(player) for player in range(len(case["balances"]))]
+    observations = []
+
+    for command in case["commands"]:
+        if command[0] == "move":
+            result = engine.move_player(names[command[1]], command[2])
+        elif command[0] == "buy":
+            result = engine.buy_space(names[command[1]])
+        else:
+            result = engine.check_game_over()
+
+        observations.append((
+            result,
+            [engine.get_player_account_balance(name) for name in names],
+            [engine.get_player_current_position(name) for name in names],
+            [engine.get_space_owner_name(index) for index in range(NUM_SPACES)]))
+
+    return observations
+
+
+def first_divergence(reference_factory, candidate_factory, case):
+    """ Find the first command after which two engines differ.
+
+    Args:
+        reference_factory (callable): returns a new reference engine
+        candidate_factory (callable): returns a new candidate engine
+        case (dict): case from generate_case
+    Returns:
+        tuple: (command index, expected observation, actual observation),
+            or None if the engines agree
+    """
+    expected = run_case(setup_engine(reference_factory(), case), case)
+    actual = run_case(setup_engine(candidate_factory(), case), case)
+    for index, (expected_observation, actual_observation) in enumerate(zip(expected, actual)):
+        if expected_observation != actual_observation:
+            return index, expected_observation, actual_observation
+    return None
+
+
+def shrink_case(case, diverges):
+    """ Reduce a diverging case to a minimal one: drop commands, then
+    shorten moves, then lower GO money and rents, while it still diverges.
+
+    Args:
+        case (dict): diverging case
+        diverges (callable): diverges(case) returns True if engines differ
+    Returns:
+        dict: smallest diverging case found
+    """
+    def with_commands(commands):
+        return dict(case, commands=commands)
+
+    # Delta debugging over the command list
+    chunk_size = max(1, len(case["commands"]) // 2)
+    while True:
+        index = 0
+        removed = False
+        while index < len(case["commands"]):
+            commands = case["commands"][:index] + case["commands"][index + chunk_size:]
+            if commands and diverges(with_commands(commands)):
+                case = with_commands(commands)
+                removed = True
+            else:
+                index += chunk_size
+        if chunk_size == 1 and not removed:
+            break
+        chunk_size = max(1, chunk_size // 2)
+
+    # Shorten each move as far as possible
+    for index, command in enumerate(case["commands"]):
+        if command[0] == "move":
+            for spaces in range(command[2]):
+                commands = list(case["commands"])
+                commands[index] = ("move", command[1], spaces)
+                if diverges(with_commands(commands)):
+                    case = with_commands(commands)
+                    break
+
+    # Zero GO money and lower rents where the divergence does not need them
+    if case["money_amount"] and diverges(dict(case, money_amount=0)):
+        case = dict(case, money_amount=0)
+    for index in range(len(case["rent_amounts_list"])):
+        for rent_amount in (10, 20, 50, 100):
+            if rent_amount >= case["rent_amounts_list"][index]:
+                break
+            rents = list(case["rent_amounts_list"])
+            rents[index] = rent_amount
+            if diverges(dict(case, rent_amounts_list=rents)):
+                case = dict(case, rent_amounts_list=rents)
+                break
+
+    return case
+
+
+def format_reproducer(case):
+    """ Write a case as the RealEstateGame calls that reproduce it.
+
+    Args:
+        case (dict): case from generate_case
+    Returns:
+        str: Python source
+    """
+    lines = ["game = RealEstateGame()",
+             "game.create_spaces({}, {})".format(case["money_amount"], case["rent_amounts_list"])]
+    for player, balance in enumerate(case["balances"]):
+        lines.append("game.create_player({!r}, {})".format(player_name(player), balance))
+    for command in case["commands"]:
+        if command[0] == "move":
+            lines.append("game.move_player({!r}, {})".format(player_name(command[1]), command[2]))
+        elif command[0] == "buy":
+            lines.append("game.buy_space({!r})".format(player_name(command[1])))
+        else:
+            lines.append("game.check_game_over()")
+    return "\n".join(lines)
+
+
+class DifferentialFuzzer:
+    """ Represents a fuzzing run comparing candidate engines to the reference.
+
+    Attributes:
+        _rng (Random): random source for cases
+        _num_commands (int): commands in each generated case
+        _pool (SharedGamePool): shared memory for the shared pool engine
+        _engines (dict): candidate name: factory returning a new engine
+    """
+
+    def __init__(self, seed=0, num_commands=100):
+        self._rng = random.Random(seed)
+        self._num_commands = num_commands
+        self._pool = SharedGamePool.create(1)
+        self._engines = {
+            "move_table": lambda: RealEstateGame(use_move_table=True),
+            "shared_pool": lambda: self._pool.view(0),
+        }
+
+    @staticmethod
+    def reference_engine():
+        """ Return a new reference engine.
+
+        Returns:
+            RealEstateGame: game resolving moves with the helper methods
+        """
+        return RealEstateGame(use_move_table=False)
+
+    def add_engine(self, name, factory):
+        """ Add a candidate engine.
+
+        Args:
+            name (str): engine name used in reports
+            factory (callable): returns a new engine with the RealEstateGame
+                interface and get_space_owner_name
+        """
+        self._engines[name] = factory
+
+    def run(self, num_cases):
+        """ Fuzz every candidate engine.
+
+        Args:
+            num_cases (int): number of cases generated
+        Returns:
+            list: (engine name, shrunk case, command index, expected
+                observation, actual observation) for each diverging engine
+        """
+        divergences = []
+        failed_engines = set()
+
+        for _ in range(num_cases):
+            case = generate_case(self._rng, self._num_commands)
+            for name, factory in self._engines.items():
+                if name in failed_engines:
+                    continue
+                if first_divergence(self.reference_engine, factory, case) is None:
+                    continue
+
+                def diverges(candidate_case, factory=factory):
+                    return first_divergence(self.reference_engine, factory,
+                                            candidate_case) is not None
+
+                shrunk_case = shrink_case(case, diverges)
+                index, expected, actual = first_divergence(self.reference_engine, factory,
+                                                           shrunk_case)
+                divergences.append((name, shrunk_case, index, expected, actual))
+                failed_engines.add(name)
+
+        return divergences
+
+    def close(self):
+        """ Free the shared memory used by the shared pool engine. """
+        self._pool.close()
+        self._pool.unlink()
+
+
+def main(argv=None):
+    """ Run the fuzzer from the command line.
+
+    Args:
+        argv (list): command line arguments; sys.argv when None
+    Returns:
+        int: exit status; 1 if any engine diverged
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    fuzzer = DifferentialFuzzer(args.seed, args.commands)
+    try:
+        divergences = fuzzer.run(args.cases)
+    finally:
+        fuzzer.close()
+
+    for name, case, index, expected, actual in divergences:
+        print("DIVERGENCE in {} after command {}".format(name, index))
+        print("  expected: {}".format(expected))
+        print("  actual:   {}".format(actual))
+        print(format_reproducer(case))
+    if not divergences:
+        print("No divergences in {} cases".format(args.cases))
+    return 1 if divergences else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+""" SQLite persistence for RealEstateGame with batched, dirty-field writes. """
+
+import sqlite3
+import time
+
+from RealEstateGame import RealEstateGame
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id TEXT NOT NULL REFERENCES games (game_id),
+    name TEXT NOT NULL,
+    account_balance INTEGER NOT NULL,
+    position_index INTEGER NOT NULL,
+    PRIMARY KEY (game_id, name)
+);
+CREATE TABLE IF NOT EXISTS spaces (
+    game_id TEXT NOT NULL REFERENCES games (game_id),
+    space_index INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    rent_amount INTEGER NOT NULL,
+    purchase_price INTEGER NOT NULL,
+    owner_name TEXT,
+    PRIMARY KEY (game_id, space_index)
+);
+"""
+
+# SET clause is filled with only the dirty player columns
+_PLAYER_UPSERT = """
+INSERT INTO players (game_id, name, account_balance, position_index)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (game_id, name) DO UPDATE SET {}
+"""
+
+_PLAYER_FIELDS = frozenset({"account_balance", "position_index"})
+
+_SPACE_UPSERT = """
+INSERT INTO spaces (game_id, space_index, name, rent_amount, purchase_price, owner_name)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (game_id, space_index) DO UPDATE SET owner_name = excluded.owner_name
+"""
+
+
+class GameStore:
+    """ Persists games to SQLite. Only fields changed since the last save are
+    written, and writes from many saves are grouped into one transaction.
+
+    Attributes:
+        _connection (sqlite3.Connection): open database connection
+        _flush_interval (float): seconds between automatic flushes
+        _last_flush (float): monotonic time of the last flush
+        _saved_games (set): game ids in the games table or pending
+        _pending_games (set): game ids not yet written to the games table
+        _pending_players (dict): (game_id, name): [balance, position, fields]
+        _pending_spaces (dict): (game_id, space_index): spaces table row
+    """
+
+    def __init__(self, path, flush_interval=0.0):
+        """ Open (or create) a store.
+
+        Args:
+            path (str): SQLite database file path
+            flush_interval (float): seconds to buffer saves before writing;
+                0 writes on every save
+        """
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._saved_games = set()
+        self._pending_games = set()
+        self._pending_players = {}
+        self._pending_spaces = {}
+
+    def save(self, game_id, game):
+        """ Queue the changed fields of a game for writing. The first save of
+        a game id this store has not written queues every field, since the
+        game may already have been saved elsewhere. Flushes when the flush
+        interval has elapsed.
+
+        Args:
+            game_id (str): unique game id
+            game (RealEstateGame): game to save
+        """
+        first_save = not self.has_game(game_id)
+        self._saved_games.add(game_id)
+        self._pending_games.add(game_id)
+
+        for player in game.get_players():
+            dirty_fields = _PLAYER_FIELDS if first_save else player.get_dirty_fields()
+            if dirty_fields:
+                key = (game_id, player.get_name())
+                pending = self._pending_players.get(key)
+                if pending is None:
+                    pending = self._pending_players[key] = [0, 0, set()]
+                pending[0] = player.get_account_balance()
+                pending[1] = player.get_position_index()
+                pending[2] |= dirty_fields
+                player.clear_dirty_fields()
+
+        for space_index, space in enumerate(game.get_spaces()):
+            if first_save or space.get_dirty_fields():
+                self._pending_spaces[(game_id, space_index)] = (
+                    game_id, space_index, space.get_name(), space.get_rent_amount(),
+                    space.get_purchase_price(), space.get_owner_name())
+                space.clear_dirty_fields()
+
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def has_game(self, game_id):
+        """ Determine if a game has been saved to this store.
+
+        Args:
+            game_id (str): unique game id
+        Returns:
+            bool: True if game_id is saved or queued for writing
+        """
+        if game_id in self._saved_games:
+            return True
+        if self._connection.execute(
+                "SELECT 1 FROM games WHERE game_id = ?", (game_id,)).fetchone() is None:
+            return False
+        self._saved_games.add(game_id)
+        return True
+
+    def flush(self):
+        """ Write all queued changes in a single transaction. """
+        player_rows = {}
+        for (game_id, name), (balance, position, fields) in self._pending_players.items():
+            player_rows.setdefault(frozenset(fields), []).append(
+                (game_id, name, balance, position))
+
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO games (game_id) VALUES (?)",
+                [(game_id,) for game_id in self._pending_games])
+            for fields, rows in player_rows.items():
+                assignments = ", ".join(
+                    "{0} = excluded.{0}".format(field) for field in sorted(fields))
+                self._connection.executemany(_PLAYER_UPSERT.format(assignments), rows)
+            self._connection.executemany(_SPACE_UPSERT, self._pending_spaces.values())
+
+        self._pending_games.clear()
+        self._pending_players.clear()
+        self._pending_spaces.clear()
+        self._last_flush = time.monotonic()
+
+    def load(self, game_id):
+        """ Rebuild a saved game.
+
+        Args:
+            game_id (str): unique game id
+        Returns:
+            RealEstateGame: restored game, with no dirty fields
+        Raises:
+            KeyError: if no game with game_id has been saved
+        """
+        self.flush()
+        if self._connection.execute(
+                "SELECT 1 FROM games WHERE game_id = ?", (game_id,)).fetchone() is None:
+            raise KeyError(game_id)
+
+        space_rows = self._connection.execute(
+            "SELECT rent_amount, owner_name FROM spaces WHERE game_id = ? "
+            "ORDER BY space_index", (game_id,)).fetchall()
+
+        game = RealEstateGame()
+        if space_rows:
+            game.create_spaces(space_rows[0][0], [row[0] for row in space_rows[1:]])
+
+        player_rows = self._connection.execute(
+            "SELECT name, account_balance, position_index FROM players "
+            "WHERE game_id = ? ORDER BY rowid", (game_id,))
+        for name, balance, position in player_rows:
+            game.create_player(name, balance)
+            game.get_players()[-1].set_position_index(position)
+
+        players = {player.get_name(): player for player in game.get_players()}
+        for space, (_, owner_name) in zip(game.get_spaces(), space_rows):
+            if owner_name is not None:
+                space.set_owner_name(owner_name)
+                players[owner_name].set_spaces_owned(space)
+
+        for item in game.get_players() + game.get_spaces():
+            item.clear_dirty_fields()
+
+        return game
+
+    def close(self):
+        """ Flush queued changes and close the database connection. """
+        self.flush()
+        self._connection.close()
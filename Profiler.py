@@ -0,0 +1,258 @@
+""" Profile simulated games and attribute time to game rule phases.
+
+Run a workload and save the profile:
+    python Profiler.py run --output base.json --collapsed base.txt
+Compare two saved profiles and exit with status 1 on regression:
+    python Profiler.py compare base.json candidate.json
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from Simulation import new_game, play_game
+
+# Game rule phase of each function; time in nested phases is not counted twice
+PHASE_FUNCTIONS = {
+    "next_roll": "dice",
+    "player_move_to_next_position": "movement",
+    "player_move_with_move_table": "movement",
+    "collect_go_money": "go_payout",
+    "pay_rent": "rent",
+    "buy_space": "purchase",
+    "remove_inactive_player_space_ownership": "bankruptcy",
+    "check_game_over": "game_over",
+}
+
+
+def run_workload(num_games=200, max_turns=500, seed=0, num_players=4, initial_balance=1000,
+                 money_amount=100, rent_amounts_list=None, use_move_table=False):
+    """ Play a batch of games.
+
+    The move table resolves movement, GO money and rent in one step, so it
+    is off by default to keep those phases separate.
+
+    Args:
+        num_games (int): number of games played
+        max_turns (int): most turns played in each game
+        seed (int): dice seed
+        num_players (int): players in each game
+        initial_balance (int): account balance of each player
+        money_amount (int): amount paid to players when land or pass GO
+        rent_amounts_list (list): list of 24 rent amounts; default board when None
+        use_move_table (bool): resolve moves from the precomputed move table
+    Returns:
+        int: total number of turns played
+    """
+    options = {}
+    if rent_amounts_list is not None:
+        options["rent_amounts_list"] = rent_amounts_list
+
+    turns = 0
+    for game_id in range(num_games):
+        game = new_game(seed, game_id, num_players, initial_balance, money_amount,
+                        use_move_table=use_move_table, **options)
+        turns += play_game(game, max_turns)[1]
+    return turns
+
+
+def profile_workload(**workload):
+    """ Run a workload under cProfile.
+
+    Args:
+        **workload: arguments for run_workload
+    Returns:
+        dict: profile with total seconds, turns, seconds per phase and
+            collapsed stacks of workload;phase;function weighted by the same
+            time, in microseconds
+    """
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    turns = profiler.runcall(run_workload, **workload)
+    total_seconds = time.perf_counter() - start
+
+    stats = pstats.Stats(profiler).stats
+    phases = Counter()
+    stacks = Counter()
+    for function, (_, _, _, cumulative_time, _) in stats.items():
+        phase = PHASE_FUNCTIONS.get(function[2])
+        if phase is None:
+            continue
+
+        # Remove time spent in nested phase functions
+        for callee, callee_stats in stats.items():
+            if callee[2] in PHASE_FUNCTIONS and function in callee_stats[4]:
+                cumulative_time -= callee_stats[4][function][3]
+
+        phases[phase] += cumulative_time
+        stacks["workload;{};{}".format(phase, function[2])] += int(cumulative_time * 1e6)
+
+    return {"mode": "cprofile", "total_seconds": total_seconds, "turns": turns,
+            "phases": dict(phases), "stacks": dict(stacks)}
+
+
+def sample_workload(interval=0.001, **workload):
+    """ Run a workload while sampling its call stack from another thread.
+
+    Args:
+        interval (float): seconds between samples
+        **workload: arguments for run_workload
+    Returns:
+        dict: profile with total seconds, turns, estimated seconds per phase
+            and collapsed stacks in samples
+    """
+    thread_id = threading.get_ident()
+    stop = threading.Event()
+    stacks = Counter()
+
+    def sample():
+        while not stop.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append("{}:{}".format(os.path.basename(code.co_filename), code.co_name))
+                frame = frame.f_back
+            stacks[";".join(reversed(names))] += 1
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        turns = run_workload(**workload)
+    finally:
+        stop.set()
+        sampler.join()
+    total_seconds = time.perf_counter() - start
+
+    # Attribute each sample to the innermost phase function on its stack
+    phases = Counter()
+    num_samples = sum(stacks.values())
+    for stack, count in stacks.items():
+        for name in reversed(stack.split(";")):
+            phase = PHASE_FUNCTIONS.get(name.rpartition(":")[2])
+            if phase is not None:
+                phases[phase] += total_seconds * count / num_samples
+                break
+
+    return {"mode": "sample", "total_seconds": total_seconds, "turns": turns,
+            "phases": dict(phases), "stacks": dict(stacks)}
+
+
+def write_collapsed_stacks(profile, path):
+    """ Write stacks in the collapsed format read by flamegraph.pl and
+    speedscope.
+
+    Args:
+        profile (dict): result of profile_workload or sample_workload
+        path (str): output file path
+    """
+    with open(path, "w") as file:
+        for stack, count in sorted(profile["stacks"].items()):
+            if count > 0:
+                file.write("{} {}\n".format(stack, count))
+
+
+def compare_profiles(baseline, candidate, threshold=0.1):
+    """ Find phases whose time per turn grew by more than threshold.
+
+    Args:
+        baseline (dict): earlier profile
+        candidate (dict): later profile
+        threshold (float): allowed fractional increase in time per turn
+    Returns:
+        list: (phase, baseline us per turn, candidate us per turn) for each
+            regressed phase, largest increase first
+    Raises:
+        ValueError: if the profiles were made in different modes
+    """
+    if baseline.get("mode") != candidate.get("mode"):
+        raise ValueError("Cannot compare {} profile with {} profile".format(
+            baseline.get("mode"), candidate.get("mode")))
+
+    regressions = []
+    for phase in sorted(set(baseline["phases"]) | set(candidate["phases"])):
+        before = baseline["phases"].get(phase, 0.0) * 1e6 / max(baseline["turns"], 1)
+        after = candidate["phases"].get(phase, 0.0) * 1e6 / max(candidate["turns"], 1)
+        if after > before * (1 + threshold):
+            regressions.append((phase, before, after))
+
+    regressions.sort(key=lambda regression: regression[2] - regression[1], reverse=True)
+    return regressions
+
+
+def main(argv=None):
+    """ Run the profiler from the command line.
+
+    Args:
+        argv (list): command line arguments; sys.argv when None
+    Returns:
+        int: exit status; 1 if compare found regressions, 2 if the
+            profiles cannot be compared
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="profile a simulation workload")
+    run_parser.add_argument("--mode", choices=["cprofile", "sample"], default="cprofile")
+    run_parser.add_argument("--games", type=int, default=200)
+    run_parser.add_argument("--max-turns", type=int, default=500)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--players", type=int, default=4)
+    run_parser.add_argument("--balance", type=int, default=1000)
+    run_parser.add_argument("--use-move-table", action="store_true")
+    run_parser.add_argument("--output", help="JSON profile path")
+    run_parser.add_argument("--collapsed", help="collapsed stacks path")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON profiles")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        workload = {"num_games": args.games, "max_turns": args.max_turns, "seed": args.seed,
+                    "num_players": args.players, "initial_balance": args.balance,
+                    "use_move_table": args.use_move_table}
+        if args.mode == "cprofile":
+            profile = profile_workload(**workload)
+        else:
+            profile = sample_workload(**workload)
+
+        print("{} turns in {:.3f}s".format(profile["turns"], profile["total_seconds"]))
+        for phase, seconds in sorted(profile["phases"].items(), key=lambda item: -item[1]):
+            print("{:<12} {:8.3f}s {:8.2f}us/turn".format(
+                phase, seconds, seconds * 1e6 / max(profile["turns"], 1)))
+
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(profile, file, indent=2)
+        if args.collapsed:
+            write_collapsed_stacks(profile, args.collapsed)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.candidate) as file:
+        candidate = json.load(file)
+
+    try:
+        regressions = compare_profiles(baseline, candidate, args.threshold)
+    except ValueError as error:
+        parser.error(str(error))
+    for phase, before, after in regressions:
+        print("REGRESSION {:<12} {:8.2f} -> {:8.2f} us/turn".format(phase, before, after))
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
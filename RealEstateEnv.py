@@ -0,0 +1,275 @@
+""" Vectorized self-play environment for training buy/skip policies on the
+RealEstateGame rules.
+
+Each of num_envs games waits on one decision: whether the player who just
+moved buys the space they landed on. step takes one action per game, then
+rolls and moves the next active player to reach the next decision. Games
+that finish are reset automatically with a new dice stream.
+
+The state of every game is kept in flat lists indexed by env, and step
+resolves all games in one pass over them instead of calling RealEstateGame
+methods. Rules and dice match a RealEstateGame created by
+Simulation.new_game with game id "<env index>:<episode>".
+"""
+
+from array import array
+
+from Dice import Dice
+from Simulation import RENT_AMOUNTS_LIST
+
+NUM_SPACES = 25
+SKIP = 0
+BUY = 1
+
+# Rolls generated for an env at a time
+_ROLL_CHUNK = 64
+
+
+class RealEstateEnv:
+    """ Represents num_envs self-play games stepped together.
+
+    Observations for all games are kept in one flat array('i') of
+    num_envs * obs_size values, updated in place by reset and step.
+    Each game's observation is:
+
+        [slot of player deciding,
+         account balance of each player slot,
+         position index of each player slot,
+         one-hot owner of each space: unowned, slot 0, slot 1, ...]
+
+    Attributes:
+        num_envs (int): number of games
+        num_players (int): players in each game
+        obs_size (int): values in each game's observation
+        observations (array): observations of all games
+        rewards (array): reward from the last step; +1 when the deciding
+            player went on to win, -1 when another player won
+        dones (array): 1 for games that finished in the last step
+        _seed (int): dice seed
+        _initial_balance (int): account balance of each player at reset
+        _rents (list): rent amount of each space; GO money at index 0
+        _purchase_prices (list): purchase price of each space
+        _max_turns (int): turns before a game is stopped without a winner
+        _balances (list): account balance of each env's player slots
+        _positions (list): position index of each env's player slots
+        _owners (list): owner slot of each env's spaces, -1 when unowned
+        _num_active (list): players with a positive balance in each env
+        _current_slots (list): slot of player deciding in each env
+        _turns (list): turns played in each env's current game
+        _episodes (list): number of games started in each env
+        _dice (list): Dice of each env's current game
+        _rolls (list): rolls of each env for turns _roll_starts onwards
+        _roll_starts (list): turn of the first roll in each env's _rolls
+        _zero_owners (array): zeros for clearing one env's owner one-hot values
+    """
+
+    def __init__(self, num_envs, num_players=2, seed=0, initial_balance=1000,
+                 money_amount=100, rent_amounts_list=RENT_AMOUNTS_LIST, max_turns=1000):
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.obs_size = 1 + 2 * num_players + NUM_SPACES * (num_players + 1)
+        self.observations = array("i", bytes(4 * num_envs * self.obs_size))
+        self.rewards = array("d", bytes(8 * num_envs))
+        self.dones = array("B", bytes(num_envs))
+        self._seed = seed
+        self._initial_balance = initial_balance
+        self._rents = [money_amount] + list(rent_amounts_list)
+        self._purchase_prices = [0] + [rent_amount * 5 for rent_amount in rent_amounts_list]
+        self._max_turns = max_turns
+        self._balances = [0] * (num_envs * num_players)
+        self._positions = [0] * (num_envs * num_players)
+        self._owners = [-1] * (num_envs * NUM_SPACES)
+        self._num_active = [0] * num_envs
+        self._current_slots = [0] * num_envs
+        self._turns = [0] * num_envs
+        self._episodes = [0] * num_envs
+        self._dice = [None] * num_envs
+        self._rolls = [None] * num_envs
+        self._roll_starts = [0] * num_envs
+        self._zero_owners = array("i", bytes(4 * NUM_SPACES * (num_players + 1)))
+
+    def reset(self):
+        """ Start a new game in every env.
+
+        Returns:
+            array: observations of all games
+        """
+        for env_index in range(self.num_envs):
+            self.reset_env(env_index)
+        return self.observations
+
+    def reset_env(self, env_index):
+        """ Helper method for reset and step. Start a new game in one env,
+        move its first player and write its observation.
+
+        Args:
+            env_index (int): index of env
+        """
+        game_id = "{}:{}".format(env_index, self._episodes[env_index])
+        self._episodes[env_index] += 1
+        self._dice[env_index] = Dice(self._seed, game_id)
+        self._rolls[env_index] = self._dice[env_index].roll_buffer(0, _ROLL_CHUNK)
+        self._roll_starts[env_index] = 0
+
+        player_start = env_index * self.num_players
+        for player_index in range(player_start, player_start + self.num_players):
+            self._balances[player_index] = self._initial_balance
+            self._positions[player_index] = 0
+        space_start = env_index * NUM_SPACES
+        self._owners[space_start:space_start + NUM_SPACES] = [-1] * NUM_SPACES
+        self._num_active[env_index] = self.num_players
+        self._current_slots[env_index] = 0
+        self._turns[env_index] = 0
+        self.write_observation(env_index)
+
+        # Player 0 moves to the first decision
+        self._current_slots[env_index] = -1
+        self.step_env(env_index, SKIP)
+
+    def step(self, actions):
+        """ Apply one action in every env and move on to the next decision.
+
+        Args:
+            actions (sequence): BUY or SKIP for each env
+        Returns:
+            tuple: (observations, rewards, dones, infos); infos holds the
+                winner and turn count of each finished game, else an empty dict
+        """
+        infos = [{} for _ in range(self.num_envs)]
+        step_env = self.step_env
+        rewards = self.rewards
+        dones = self.dones
+
+        for env_index in range(self.num_envs):
+            slot = self._current_slots[env_index]
+            winner_slot = step_env(env_index, actions[env_index])
+            turns = self._turns[env_index]
+
+            if winner_slot == -1 and turns < self._max_turns:
+                rewards[env_index] = 0.0
+                dones[env_index] = 0
+                continue
+
+            if winner_slot == -1:
+                rewards[env_index] = 0.0
+                winner = ""
+            else:
+                rewards[env_index] = 1.0 if winner_slot == slot else -1.0
+                winner = str(winner_slot)
+            dones[env_index] = 1
+            infos[env_index] = {"winner": winner, "turns": turns}
+            self.reset_env(env_index)
+
+        return self.observations, rewards, dones, infos
+
+    def step_env(self, env_index, action):
+        """ Helper method for step and reset_env. Apply one env's action, then
+        roll and move the next active player, updating its observation.
+
+        Args:
+            env_index (int): index of env
+            action (int): BUY or SKIP
+        Returns:
+            int: slot of winner if game over, else -1
+        """
+        num_players = self.num_players
+        balances = self._balances
+        positions = self._positions
+        owners = self._owners
+        observations = self.observations
+        player_start = env_index * num_players
+        space_start = env_index * NUM_SPACES
+        start = env_index * self.obs_size
+        owners_start = start + 1 + 2 * num_players
+        slot = self._current_slots[env_index]
+
+        # Deciding player buys the space they are on
+        if action == BUY:
+            player_index = player_start + slot
+            position_index = positions[player_index]
+            purchase_price = self._purchase_prices[position_index]
+            if (balances[player_index] > purchase_price and position_index != 0
+                    and owners[space_start + position_index] == -1):
+                balances[player_index] -= purchase_price
+                owners[space_start + position_index] = slot
+                observations[start + 1 + slot] = balances[player_index]
+                one_hot = owners_start + position_index * (num_players + 1)
+                observations[one_hot] = 0
+                observations[one_hot + 1 + slot] = 1
+
+        # Next active player rolls
+        for _ in range(num_players):
+            slot = (slot + 1) % num_players
+            if balances[player_start + slot] > 0:
+                break
+        self._current_slots[env_index] = slot
+        observations[start] = slot
+
+        turn = self._turns[env_index]
+        self._turns[env_index] = turn + 1
+        roll_index = turn - self._roll_starts[env_index]
+        if roll_index == _ROLL_CHUNK:
+            self._rolls[env_index] = self._dice[env_index].roll_buffer(turn, _ROLL_CHUNK)
+            self._roll_starts[env_index] = turn
+            roll_index = 0
+
+        # Move player, collecting GO money when landing on or passing GO
+        player_index = player_start + slot
+        balance = balances[player_index]
+        position_index = positions[player_index] + self._rolls[env_index][roll_index]
+        if position_index >= NUM_SPACES:
+            balance += self._rents[0]
+            position_index -= NUM_SPACES
+        positions[player_index] = position_index
+        observations[start + 1 + num_players + slot] = position_index
+
+        # Pay rent on spaces owned by another player and not GO
+        owner_slot = owners[space_start + position_index]
+        if owner_slot != -1 and owner_slot != slot and position_index != 0:
+            rent_amount = min(self._rents[position_index], balance)
+            balance -= rent_amount
+            balances[player_start + owner_slot] += rent_amount
+            observations[start + 1 + owner_slot] = balances[player_start + owner_slot]
+        balances[player_index] = balance
+        observations[start + 1 + slot] = balance
+
+        if balance > 0:
+            return -1
+
+        # Remove ownership of spaces from inactive player
+        for space_index in range(NUM_SPACES):
+            if owners[space_start + space_index] == slot:
+                owners[space_start + space_index] = -1
+                one_hot = owners_start + space_index * (num_players + 1)
+                observations[one_hot] = 1
+                observations[one_hot + 1 + slot] = 0
+
+        self._num_active[env_index] -= 1
+        if self._num_active[env_index] != 1:
+            return -1
+        for winner_slot in range(num_players):
+            if balances[player_start + winner_slot] > 0:
+                return winner_slot
+        return -1
+
+    def write_observation(self, env_index):
+        """ Helper method for reset_env. Fill one env's observation.
+
+        Args:
+            env_index (int): index of env
+        """
+        observations = self.observations
+        start = env_index * self.obs_size
+        owners_start = start + 1 + 2 * self.num_players
+        player_start = env_index * self.num_players
+
+        observations[start] = self._current_slots[env_index]
+        for slot in range(self.num_players):
+            observations[start + 1 + slot] = self._balances[player_start + slot]
+            observations[start + 1 + self.num_players + slot] = self._positions[player_start + slot]
+
+        observations[owners_start:start + self.obs_size] = self._zero_owners
+        space_start = env_index * NUM_SPACES
+        for space_index in range(NUM_SPACES):
+            owner_slot = self._owners[space_start + space_index]
+            observations[owners_start + space_index * (self.num_players + 1) + owner_slot + 1] = 1
@@ -1,16 +1,48 @@
 """ Backend of Real Estate Board Game similar to Monopoly. """
 
+from functools import partial
+
+from BalanceHistory import BalanceHistory
+
+# Largest move resolved from the move table (two six-sided dice)
+MAX_TABLE_ROLL = 12
+
+
 class RealEstateGame:
     """ Represents a real estate board game.
 
     Attributes:
         _players_in_game (dict): dictionary of all players; name: Player object
         _game_spaces (list): list of Space objects; tracks space index
+        _use_move_table (bool): resolve moves from _move_table when possible
+        _move_table (list): (next position, GO money or None, rent, owner name)
+            for each position * (MAX_TABLE_ROLL + 1) + roll
+        _dice (Dice): dice rolled by move_player when no move is given
+        _balance_histories (dict): name: BalanceHistory, when tracking enabled
+        _balance_history_options (dict): BalanceHistory arguments, or None
+        _early_termination (callable): criterion(game) returning a winner
+            name or empty string, checked by check_game_over; or None
+        _early_termination_interval (int): check_game_over calls between
+            early termination checks
+        _game_over_checks (int): number of check_game_over calls since the
+            early termination criterion was set
+        _early_winner (str): winner declared by early termination, or empty
+        _game_over_reason (str): how the game ended; empty while not over
     """
 
-    def __init__(self):
+    def __init__(self, use_move_table=True):
         self._players_in_game = {}
         self._game_spaces = []
+        self._use_move_table = use_move_table
+        self._move_table = []
+        self._dice = None
+        self._balance_histories = {}
+        self._balance_history_options = None
+        self._early_termination = None
+        self._early_termination_interval = 1
+        self._game_over_checks = 0
+        self._early_winner = ""
+        self._game_over_reason = ""
 
     def create_spaces(self, money_amount, rent_amounts_list):
         """ Create spaces for board game.
@@ -26,6 +58,51 @@ class RealEstateGame:
         for index, rent_amount in enumerate(rent_amounts_list, 1):
             self._game_spaces.append(Space(str(index), rent_amount, rent_amount * 5))
 
+        # Move table only covers the standard 25 space board
+        if self._use_move_table and len(self._game_spaces) == 25:
+            self.build_move_table()
+
+    def build_move_table(self):
+        """ Precompute next position, GO money and rent for every position and
+        roll up to MAX_TABLE_ROLL. Keep the table current as ownership changes.
+        """
+        self._move_table = []
+        for position_index in range(25):
+            for roll in range(MAX_TABLE_ROLL + 1):
+                next_position_index = position_index + roll
+                go_amount = None
+                if next_position_index > 24:
+                    go_amount = self._game_spaces[0].get_rent_amount()
+                    next_position_index -= 25
+                self._move_table.append((next_position_index, go_amount, 0, None))
+
+        for space_index, space in enumerate(self._game_spaces):
+            space.set_owner_listener(partial(self.update_move_table, space_index))
+            self.update_move_table(space_index)
+
+    def update_move_table(self, space_index):
+        """ Helper method for build_move_table. Update rent owed in every move
+        table entry that lands on a space.
+
+        Args:
+            space_index (int): index of space whose owner changed
+        """
+        owner_name = self._game_spaces[space_index].get_owner_name()
+        rent_amount = self._game_spaces[space_index].get_rent_amount()
+
+        # No rent is paid on GO
+        if space_index == 0:
+            owner_name = None
+
+        for roll in range(MAX_TABLE_ROLL + 1):
+            position_index = space_index - roll
+            if position_index < 0:
+                position_index += 25
+            table_index = position_index * (MAX_TABLE_ROLL + 1) + roll
+            next_position_index, go_amount, _, _ = self._move_table[table_index]
+            self._move_table[table_index] = (next_position_index, go_amount,
+                                             rent_amount, owner_name)
+
     def create_player(self, name, initial_balance):
         """ Create player for game.
 
@@ -35,6 +112,61 @@ class RealEstateGame:
         """
         self._players_in_game[name] = Player(name, initial_balance)
 
+        if self._balance_history_options is not None:
+            # Pad earlier turns so every history is indexed by game turn
+            history = BalanceHistory(**self._balance_history_options)
+            for _ in range(self.get_balance_history_length()):
+                history.append(initial_balance)
+            self._balance_histories[name] = history
+
+    def enable_balance_history(self, keyframe_interval=256, delta_of_delta=False):
+        """ Start recording every player's balance after each move. Entry 0
+        of each history is the balance when recording started, and entry t is
+        the balance after the t-th move made in the game.
+
+        Args:
+            keyframe_interval (int): turns between stored full balances
+            delta_of_delta (bool): store second differences of balances
+        """
+        self._balance_history_options = {"keyframe_interval": keyframe_interval,
+                                          "delta_of_delta": delta_of_delta}
+        self._balance_histories = {}
+        for name in self._players_in_game:
+            self._balance_histories[name] = BalanceHistory(**self._balance_history_options)
+        self.record_balance_history()
+
+    def record_balance_history(self):
+        """ Helper method for move_player. Append every player's current
+        balance to their balance history.
+        """
+        for name, history in self._balance_histories.items():
+            history.append(self._players_in_game[name].get_account_balance())
+
+    def get_balance_history_length(self):
+        """ Retrieve the number of recorded turns.
+
+        Returns:
+            int: number of entries in each balance history
+        """
+        if self._balance_histories:
+            return len(next(iter(self._balance_histories.values())))
+        # Recording started before any players were created
+        return 1 if self._balance_history_options is not None else 0
+
+    def balance_history(self, name):
+        """ Retrieve the recorded balances of a player.
+
+        Args:
+            name (str): unique player name
+        Returns:
+            BalanceHistory: balances indexed by turn
+        Raises:
+            ValueError: if balance history is not enabled
+        """
+        if self._balance_history_options is None:
+            raise ValueError("Balance history not enabled")
+        return self._balance_histories[name]
+
     def get_player_account_balance(self, name):
         """ Retrieve the player's account balance.
 
@@ -55,6 +187,68 @@ class RealEstateGame:
         """
         return self._players_in_game[name].get_position_index()
 
+    def get_space_owner_name(self, space_index):
+        """ Retrieve the owner of a space.
+
+        Args:
+            space_index (int): index of space on board
+        Returns:
+            None: if space unowned
+            str: name of player who owns space, if owned
+        """
+        return self._game_spaces[space_index].get_owner_name()
+
+    def set_dice(self, dice):
+        """ Set dice rolled by move_player when no number of spaces is given.
+
+        Args:
+            dice (Dice): dice for this game
+        """
+        self._dice = dice
+
+    def set_early_termination(self, criterion, check_interval=1):
+        """ Let check_game_over declare a winner before only one player is
+        left. The criterion is only checked while more than one player is
+        active.
+
+        Args:
+            criterion (callable): criterion(game) returns name of winner, or
+                empty string to keep playing; None turns early termination off
+            check_interval (int): check_game_over calls between criterion
+                checks, counted from this call
+        """
+        self._early_termination = criterion
+        self._early_termination_interval = check_interval
+        self._early_winner = ""
+        self._game_over_checks = 0
+        self._game_over_reason = ""
+
+    def get_game_over_reason(self):
+        """ Retrieve how the game ended.
+
+        Returns:
+            str: "bankruptcy" if every other player ran out of money,
+                "early_termination" if the early termination criterion chose
+                the winner, empty string if game not over
+        """
+        return self._game_over_reason
+
+    def get_players(self):
+        """ Retrieve all players in the order they were created.
+
+        Returns:
+            list: list of Player objects
+        """
+        return list(self._players_in_game.values())
+
+    def get_spaces(self):
+        """ Retrieve all board spaces in board order.
+
+        Returns:
+            list: list of Space objects; index 0 is GO
+        """
+        return self._game_spaces
+
     def buy_space(self, name):
         """ Purchase space on board with player's account balance.
 
@@ -100,8 +294,7 @@ class RealEstateGame:
             self._players_in_game[name].set_position_index(next_position_index)
         else:
             # Collect money for landing/passing "GO"
-            amount_paid = self._game_spaces[0].get_rent_amount()
-            self._players_in_game[name].set_account_balance(amount_paid)
+            self.collect_go_money(name)
 
             # Loop player's position back to start of board
             next_position_index -= 25
@@ -109,6 +302,16 @@ class RealEstateGame:
 
         return next_position_index
 
+    def collect_go_money(self, name):
+        """ Helper method for player_move_to_next_position. Pay player the GO
+        money for landing on or passing GO.
+
+        Args:
+            name (str): unique player name
+        """
+        amount_paid = self._game_spaces[0].get_rent_amount()
+        self._players_in_game[name].set_account_balance(amount_paid)
+
     def pay_rent(self, name, next_position_index):
         """ Helper method for move player. Calculate rent player needs to pay.
         Pay any rent owed.
@@ -150,27 +353,67 @@ class RealEstateGame:
             # Remove spaces from spaces_owned list in class Player
             self._players_in_game[name].remove_all_spaces_owned()
 
-    def move_player(self, name, num_spaces_to_move):
+    def player_move_with_move_table(self, name, num_spaces_to_move):
+        """ Helper method for move_player. Move player, collect GO money and
+        pay any rent owed using a single move table lookup.
+
+        Args:
+            name (str): unique player name
+            num_spaces_to_move (int): number of spaces, 0 to MAX_TABLE_ROLL
+        """
+        player = self._players_in_game[name]
+        table_index = player.get_position_index() * (MAX_TABLE_ROLL + 1) + num_spaces_to_move
+        next_position_index, go_amount, rent_amount, owner_name = self._move_table[table_index]
+
+        player.set_position_index(next_position_index)
+        if go_amount is not None:
+            player.set_account_balance(go_amount)
+
+        if owner_name is not None and owner_name != name:
+            # Change rent amount to account balance when balance lower than rent
+            account_balance = player.get_account_balance()
+            if account_balance < rent_amount:
+                rent_amount = account_balance
+
+            player.set_account_balance(- rent_amount)
+            self._players_in_game[owner_name].set_account_balance(rent_amount)
+
+    def move_player(self, name, num_spaces_to_move=None):
         """ Move player a specified amount of spaces on board. Pay any rent owed.
         Remove inactive player ownership of spaces.
 
         Args:
             name (str): unique player name
-            num_spaces_to_move (int): number of spaces to move player on board
+            num_spaces_to_move (int): number of spaces to move player on board;
+                rolled with the game's dice when None
+        Raises:
+            ValueError: if num_spaces_to_move is None and no dice are set
         """
         # No movement when account balance is zero
         if self._players_in_game[name].get_account_balance() == 0:
             return
 
-        # Move player and get next position index
-        next_pos_index = self.player_move_to_next_position(name, num_spaces_to_move)
+        if num_spaces_to_move is None:
+            if self._dice is None:
+                raise ValueError("No dice set for game")
+            num_spaces_to_move = self._dice.next_roll()
+
+        if self._move_table and 0 <= num_spaces_to_move <= MAX_TABLE_ROLL:
+            # Move player and pay rent owed from precomputed table
+            self.player_move_with_move_table(name, num_spaces_to_move)
+        else:
+            # Move player and get next position index
+            next_pos_index = self.player_move_to_next_position(name, num_spaces_to_move)
 
-        # Player pays rent owed
-        self.pay_rent(name, next_pos_index)
+            # Player pays rent owed
+            self.pay_rent(name, next_pos_index)
 
         # Remove inactive player ownership of spaces
         self.remove_inactive_player_space_ownership(name)
 
+        if self._balance_histories:
+            self.record_balance_history()
+
     def check_game_over(self):
         """ Determine if game is over and return name of winner.
 
@@ -178,6 +421,11 @@ class RealEstateGame:
             str: name of winner, if game over
             str: empty string, if game not over
         """
+        # Winner declared by early termination stays the winner
+        if self._early_winner:
+            self._game_over_reason = "early_termination"
+            return self._early_winner
+
         # Create list of active players
         active_players = []
         for name, player_object in self._players_in_game.items():
@@ -186,11 +434,23 @@ class RealEstateGame:
 
         # Game over when there is 1 active player
         if len(active_players) == 1:
+            self._game_over_reason = "bankruptcy"
             # Return winning player name
             return active_players[0]
-        else:
-            # Return empty string if game is not over
-            return ""
+
+        # Game over when the winner is already clear among active players
+        self._game_over_checks += 1
+        if (self._early_termination is not None and len(active_players) > 1
+                and self._game_over_checks % self._early_termination_interval == 0):
+            winner = self._early_termination(self)
+            if winner:
+                self._early_winner = winner
+                self._game_over_reason = "early_termination"
+                return winner
+
+        # Return empty string if game is not over
+        self._game_over_reason = ""
+        return ""
 
 
 class Player:
@@ -201,6 +461,7 @@ class Player:
         _account_balance (int): player account balance
         _position_index (int): index of player's position on board
         _spaces_owned (list): list of Space objects owned by player
+        _dirty_fields (set): names of fields changed since last save
     """
 
     def __init__(self, name, account_balance):
@@ -208,6 +469,15 @@ class Player:
         self._account_balance = account_balance
         self._position_index = 0
         self._spaces_owned = []
+        self._dirty_fields = {"account_balance", "position_index"}
+
+    def get_name(self):
+        """ Return player name.
+
+        Returns:
+            str: unique player name
+        """
+        return self._name
 
     def get_account_balance(self):
         """ Return player account balance.
@@ -240,6 +510,7 @@ class Player:
             amount_changed (int): amount account balance will be changed
         """
         self._account_balance += amount_changed
+        self._dirty_fields.add("account_balance")
 
     def set_position_index(self, new_position_index):
         """ Set player position index.
@@ -248,6 +519,7 @@ class Player:
             new_position_index (int): index of space on board player moving to
         """
         self._position_index = new_position_index
+        self._dirty_fields.add("position_index")
 
     def set_spaces_owned(self, space):
         """ Add new space purchased by player.
@@ -261,6 +533,18 @@ class Player:
         """ Remove all previously purchased spaces from list. """
         self._spaces_owned = []
 
+    def get_dirty_fields(self):
+        """ Return fields changed since the player was last saved.
+
+        Returns:
+            set: names of changed fields
+        """
+        return self._dirty_fields
+
+    def clear_dirty_fields(self):
+        """ Mark all fields as saved. """
+        self._dirty_fields = set()
+
 
 class Space:
     """ Represents space on game board.
@@ -270,6 +554,8 @@ class Space:
         _rent_amount (int): rental price for landing on space when owned
         _purchase_price (int): cost to purchase space
         _owner_name (str): name of player who purchased space
+        _dirty_fields (set): names of fields changed since last save
+        _owner_listener (callable): called with no arguments when owner changes
     """
 
     def __init__(self, name, rent_amount, purchase_price):
@@ -277,6 +563,16 @@ class Space:
         self._rent_amount = rent_amount
         self._purchase_price = purchase_price
         self._owner_name = None
+        self._dirty_fields = {"owner_name"}
+        self._owner_listener = None
+
+    def get_name(self):
+        """ Return space name.
+
+        Returns:
+            str: name of space
+        """
+        return self._name
 
     def get_rent_amount(self):
         """ Return space rent amount.
@@ -310,3 +606,27 @@ class Space:
             name (str): player name
         """
         self._owner_name = name
+        self._dirty_fields.add("owner_name")
+
+        if self._owner_listener is not None:
+            self._owner_listener()
+
+    def set_owner_listener(self, listener):
+        """ Register function to call whenever the space owner changes.
+
+        Args:
+            listener (callable): function taking no arguments, or None
+        """
+        self._owner_listener = listener
+
+    def get_dirty_fields(self):
+        """ Return fields changed since the space was last saved.
+
+        Returns:
+            set: names of changed fields
+        """
+        return self._dirty_fields
+
+    def clear_dirty_fields(self):
+        """ Mark all fields as saved. """
+        self._dirty_fields = set()
@@ -0,0 +1,217 @@
+""" Search rent tables for create_spaces that meet game design targets.
+
+A genetic algorithm evolves tables of 24 rent amounts. Each candidate is
+scored on how far its mean game length is from target_turns and how far the
+first player's win rate is from a fair 1 / num_players. Every candidate
+plays the same dice streams (common random numbers), candidates that are
+clearly losing are dropped after a fraction of the games (racing), and
+games are played in parallel worker processes.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from Simulation import RENT_AMOUNTS_LIST, new_game, play_game
+
+
+def evaluate_games(rent_amounts_list, game_ids, seed, game_options, max_turns):
+    """ Play games with a rent table.
+
+    Args:
+        rent_amounts_list (list): list of 24 rent amounts
+        game_ids (list): game ids, which select the dice streams
+        seed (int): dice seed
+        game_options (dict): other arguments for Simulation.new_game
+        max_turns (int): most turns played in each game
+    Returns:
+        list: (name of winner or empty string, turns played) for each game
+    """
+    results = []
+    for game_id in game_ids:
+        game = new_game(seed, game_id, rent_amounts_list=rent_amounts_list, **game_options)
+        results.append(play_game(game, max_turns))
+    return results
+
+
+class RentOptimizer:
+    """ Represents a genetic algorithm search over rent tables.
+
+    Attributes:
+        _target_turns (int): desired mean number of turns per game
+        _turns_weight (float): weight of game length error in loss
+        _advantage_weight (float): weight of first player advantage in loss
+        _num_games (int): games played by candidates that are not dropped
+        _rungs (list): games played before each racing cut
+        _population_size (int): candidates in each generation
+        _elite_count (int): best candidates kept unchanged each generation
+        _min_rent (int): lowest rent amount allowed
+        _max_rent (int): highest rent amount allowed
+        _rent_step (int): rent amounts are multiples of rent_step
+        _seed (int): dice seed shared by all candidates
+        _rng (Random): random source for the search itself
+        _workers (int): worker processes; 1 plays games in this process
+        _game_options (dict): other arguments for Simulation.new_game
+        _max_turns (int): most turns played in each game
+        _population (list): rent tables of the current generation
+        _results_cache (dict): rent table tuple: results of games played so far
+    """
+
+    def __init__(self, base_rents=RENT_AMOUNTS_LIST, target_turns=300, turns_weight=1.0,
+                 advantage_weight=1.0, num_games=64, population_size=16, elite_count=2,
+                 min_rent=10, max_rent=1000, rent_step=10, seed=0, workers=1,
+                 num_players=4, initial_balance=1000, money_amount=100, max_turns=2000):
+        self._target_turns = target_turns
+        self._turns_weight = turns_weight
+        self._advantage_weight = advantage_weight
+        self._num_games = num_games
+        self._rungs = sorted({max(1, num_games // 4), max(1, num_games // 2), num_games})
+        self._population_size = population_size
+        self._elite_count = elite_count
+        self._min_rent = min_rent
+        self._max_rent = max_rent
+        self._rent_step = rent_step
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._workers = workers
+        self._game_options = {"num_players": num_players, "initial_balance": initial_balance,
+                              "money_amount": money_amount}
+        self._max_turns = max_turns
+
+        self._results_cache = {}
+        self._population = [list(base_rents)]
+        while len(self._population) < population_size:
+            self._population.append(self.mutate(base_rents, 0.5))
+
+    def mutate(self, rent_amounts_list, scale):
+        """ Return a copy of a rent table with each amount scaled at random.
+
+        Args:
+            rent_amounts_list (list): list of 24 rent amounts
+            scale (float): standard deviation of the scaling factor
+        Returns:
+            list: new list of 24 rent amounts
+        """
+        mutated = []
+        for rent_amount in rent_amounts_list:
+            rent_amount *= max(0.0, self._rng.gauss(1.0, scale))
+            rent_amount = round(rent_amount / self._rent_step) * self._rent_step
+            mutated.append(min(self._max_rent, max(self._min_rent, rent_amount)))
+        return mutated
+
+    def crossover(self, first_rents, second_rents):
+        """ Return a rent table taking each amount from either parent.
+
+        Args:
+            first_rents (list): list of 24 rent amounts
+            second_rents (list): list of 24 rent amounts
+        Returns:
+            list: new list of 24 rent amounts
+        """
+        return [self._rng.choice(amounts) for amounts in zip(first_rents, second_rents)]
+
+    def loss(self, results):
+        """ Score game results against the design targets.
+
+        Args:
+            results (list): (name of winner, turns played) for each game
+        Returns:
+            float: loss; 0 when every target is met
+        """
+        mean_turns = sum(turns for _, turns in results) / len(results)
+        first_player_wins = sum(1 for winner, _ in results if winner == "0") / len(results)
+        fair_share = 1 / self._game_options["num_players"]
+
+        turns_error = (mean_turns - self._target_turns) / self._target_turns
+        return (self._turns_weight * turns_error ** 2
+                + self._advantage_weight * (first_player_wins - fair_share) ** 2)
+
+    def evaluate_population(self, executor=None):
+        """ Score the current generation, dropping the worse half of the
+        remaining candidates at each racing rung.
+
+        Args:
+            executor (Executor): pool used to play games; this process when None
+        Returns:
+            list: (loss, rent table) of candidates that played every game, best first
+        """
+        # Games already played by a candidate are never replayed
+        results = [self._results_cache.setdefault(tuple(rents), [])
+                   for rents in self._population]
+        remaining = list(range(len(self._population)))
+
+        for rung_index, num_games in enumerate(self._rungs):
+            arguments = []
+            scheduled = set()
+            for index in remaining:
+                # Identical candidates share one results list
+                key = tuple(self._population[index])
+                if len(results[index]) < num_games and key not in scheduled:
+                    scheduled.add(key)
+                    game_ids = list(range(len(results[index]), num_games))
+                    arguments.append((index, (self._population[index], game_ids, self._seed,
+                                              self._game_options, self._max_turns)))
+
+            if executor is None or not arguments:
+                rung_results = [evaluate_games(*argument) for _, argument in arguments]
+            else:
+                rung_results = executor.map(evaluate_games,
+                                            *zip(*[argument for _, argument in arguments]))
+
+            for (index, _), candidate_results in zip(arguments, rung_results):
+                results[index].extend(candidate_results)
+
+            remaining.sort(key=lambda index: self.loss(results[index][:num_games]))
+            if rung_index < len(self._rungs) - 1:
+                keep = max(self._elite_count, (len(remaining) + 1) // 2)
+                remaining = remaining[:keep]
+
+        return [(self.loss(results[index]), self._population[index]) for index in remaining]
+
+    def next_generation(self, ranked):
+        """ Replace the population with elites and their offspring.
+
+        Args:
+            ranked (list): (loss, rent table) of surviving candidates, best first
+        """
+        parents = [rents for _, rents in ranked]
+        population = parents[:self._elite_count]
+        while len(population) < self._population_size:
+            if len(parents) > 1:
+                first_rents, second_rents = self._rng.sample(parents, 2)
+            else:
+                first_rents = second_rents = parents[0]
+            population.append(self.mutate(self.crossover(first_rents, second_rents), 0.1))
+        self._population = population
+
+    def optimize(self, generations=10):
+        """ Run the search.
+
+        Args:
+            generations (int): number of generations
+        Returns:
+            tuple: (best rent table, its loss)
+        """
+        executor = None
+        if self._workers > 1:
+            executor = ProcessPoolExecutor(self._workers)
+
+        try:
+            best_loss, best_rents = float("inf"), None
+            for _ in range(generations):
+                ranked = self.evaluate_population(executor)
+                if ranked[0][0] < best_loss:
+                    best_loss, best_rents = ranked[0]
+                self.next_generation(ranked)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        return best_rents, best_loss
+
+
+if __name__ == "__main__":
+    optimizer = RentOptimizer(workers=os.cpu_count() or 1)
+    rents, loss = optimizer.optimize()
+    print("loss {:.4f}".format(loss))
+    print(rents)
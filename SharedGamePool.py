@@ -0,0 +1,487 @@
+""" Games kept in shared memory so several processes can read and update them
+in place without pickling.
+
+Each game occupies a fixed-size record of 64 bit integers:
+
+    [num_players, players version (increased whenever players change),
+     rent amount of each of the 25 spaces (GO money at index 0),
+     owner player slot of each of the 25 spaces (-1 when unowned),
+     account balance of each player slot,
+     position index of each player slot]
+
+followed, after all records, by each game's player names as fixed-width
+UTF-8 strings. Writers must not share a game; readers may look at any game
+at any time.
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from RealEstateGame import RealEstateGame
+
+NUM_SPACES = 25
+NAME_SIZE = 32
+
+_POOL_HEADER = 2
+_GAME_HEADER = 2
+_PLAYERS_VERSION = 1
+_RENTS = _GAME_HEADER
+_OWNERS = _RENTS + NUM_SPACES
+_BALANCES = _OWNERS + NUM_SPACES
+
+# Names of shared memory blocks created by this process
+_created_names = set()
+
+
+class SharedGamePool:
+    """ Represents a fixed number of games stored in one shared memory block.
+
+    Attributes:
+        _shared_memory (SharedMemory): underlying shared memory block
+        _ints (memoryview): 64 bit integer view of game records
+        _num_games (int): number of game records
+        _max_players (int): player slots in each game
+        _record_size (int): integers in each game record
+        _names_offset (int): byte offset of player names
+    """
+
+    def __init__(self, shared_memory_block, num_games, max_players):
+        self._shared_memory = shared_memory_block
+        self._num_games = num_games
+        self._max_players = max_players
+        self._record_size = _BALANCES + 2 * max_players
+        self._names_offset = 8 * (_POOL_HEADER + num_games * self._record_size)
+        self._ints = shared_memory_block.buf[:self._names_offset].cast("q")
+
+    @classmethod
+    def create(cls, num_games, max_players=4, name=None):
+        """ Create a pool of empty games.
+
+        Args:
+            num_games (int): number of games in pool
+            max_players (int): most players in each game
+            name (str): shared memory name; chosen by the system when None
+        Returns:
+            SharedGamePool: new pool
+        """
+        record_size = _BALANCES + 2 * max_players
+        size = (8 * (_POOL_HEADER + num_games * record_size)
+                + num_games * max_players * NAME_SIZE)
+        block = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created_names.add(block._name)
+        pool = cls(block, num_games, max_players)
+        pool._ints[0] = num_games
+        pool._ints[1] = max_players
+        return pool
+
+    @classmethod
+    def attach(cls, name):
+        """ Open a pool created by another process. Only the creating
+        process unlinks the shared memory; this process just closes it.
+
+        Args:
+            name (str): shared memory name from get_name
+        Returns:
+            SharedGamePool: pool sharing the same memory
+        """
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            # Only the creating process's resource tracker may unlink the block
+            if block._name not in _created_names:
+                resource_tracker.unregister(block._name, "shared_memory")
+        header = block.buf[:8 * _POOL_HEADER].cast("q")
+        num_games, max_players = header[0], header[1]
+        header.release()
+        return cls(block, num_games, max_players)
+
+    def get_name(self):
+        """ Return shared memory name used by attach.
+
+        Returns:
+            str: shared memory name
+        """
+        return self._shared_memory.name
+
+    def get_num_games(self):
+        """ Return number of games in pool.
+
+        Returns:
+            int: number of games
+        """
+        return self._num_games
+
+    def get_max_players(self):
+        """ Return number of player slots in each game.
+
+        Returns:
+            int: player slots
+        """
+        return self._max_players
+
+    def view(self, game_index):
+        """ Return a view that reads and writes a game in place.
+
+        Args:
+            game_index (int): index of game in pool
+        Returns:
+            SharedGameView: view of game
+        Raises:
+            IndexError: if game_index is out of range
+        """
+        if not 0 <= game_index < self._num_games:
+            raise IndexError("game index out of range")
+        return SharedGameView(self, game_index)
+
+    def store_game(self, game_index, game):
+        """ Copy a game into the pool, replacing the game at game_index.
+
+        Args:
+            game_index (int): index of game in pool
+            game (RealEstateGame): game with 25 spaces and at most max_players
+        Returns:
+            SharedGameView: view of stored game
+        """
+        spaces = game.get_spaces()
+        view = self.view(game_index)
+        view.create_spaces(spaces[0].get_rent_amount(),
+                           [space.get_rent_amount() for space in spaces[1:]])
+
+        for player in game.get_players():
+            view.create_player(player.get_name(), player.get_account_balance())
+            view.set_player_current_position(player.get_name(), player.get_position_index())
+
+        for space_index, space in enumerate(spaces):
+            if space.get_owner_name() is not None:
+                view.set_space_owner_name(space_index, space.get_owner_name())
+
+        return view
+
+    def get_record_size(self):
+        """ Return number of integers in each game record.
+
+        Returns:
+            int: record size
+        """
+        return self._record_size
+
+    def get_ints(self):
+        """ Return 64 bit integer view of the pool's game records.
+
+        Returns:
+            memoryview: shared integers
+        """
+        return self._ints
+
+    def get_record_offset(self, game_index):
+        """ Return index of a game's record in get_ints.
+
+        Args:
+            game_index (int): index of game in pool
+        Returns:
+            int: integer offset of record
+        """
+        return _POOL_HEADER + game_index * self._record_size
+
+    def get_name_bytes(self, game_index, slot):
+        """ Return shared bytes holding a player's name.
+
+        Args:
+            game_index (int): index of game in pool
+            slot (int): player slot
+        Returns:
+            memoryview: NAME_SIZE shared bytes
+        """
+        start = self._names_offset + (game_index * self._max_players + slot) * NAME_SIZE
+        return self._shared_memory.buf[start:start + NAME_SIZE]
+
+    def close(self):
+        """ Detach from shared memory in this process. Views become unusable. """
+        self._ints.release()
+        self._shared_memory.close()
+
+    def unlink(self):
+        """ Free shared memory once every process has closed the pool. """
+        self._shared_memory.unlink()
+        _created_names.discard(self._shared_memory._name)
+
+
+class SharedGameView:
+    """ Represents one game in a SharedGamePool with the RealEstateGame
+    interface. Every read and write goes directly to shared memory.
+
+    Attributes:
+        _pool (SharedGamePool): pool holding the game
+        _game_index (int): index of game in pool
+        _ints (memoryview): shared integers of the pool
+        _offset (int): integer offset of the game's record
+        _player_slots (dict): name: player slot, read from shared memory
+        _player_names (list): player name of each slot
+        _players_version (int): players version when names were read
+    """
+
+    def __init__(self, pool, game_index):
+        self._pool = pool
+        self._game_index = game_index
+        self._ints = pool.get_ints()
+        self._offset = pool.get_record_offset(game_index)
+        self._player_slots = {}
+        self._player_names = []
+        self._players_version = None
+        self.refresh_player_slots()
+
+    def refresh_player_slots(self):
+        """ Reload player names if they changed since they were last read,
+        e.g. after another process added players or stored a new game.
+        """
+        version = self._ints[self._offset + _PLAYERS_VERSION]
+        if version == self._players_version:
+            return
+
+        self._players_version = version
+        self._player_slots = {}
+        self._player_names = []
+        for slot in range(self._ints[self._offset]):
+            name_bytes = self._pool.get_name_bytes(self._game_index, slot)
+            name = bytes(name_bytes).rstrip(b"\0").decode()
+            name_bytes.release()
+            self._player_slots[name] = slot
+            self._player_names.append(name)
+
+    def create_spaces(self, money_amount, rent_amounts_list):
+        """ Reset the game and create its spaces.
+
+        Args:
+            money_amount (int): amount paid to players when land or pass GO
+            rent_amounts_list (list): list of 24 rent amounts
+        Raises:
+            ValueError: if rent_amounts_list does not have 24 amounts
+        """
+        if len(rent_amounts_list) != NUM_SPACES - 1:
+            raise ValueError("Shared games have 25 spaces")
+
+        offset = self._offset
+        record_size = self._pool.get_record_size()
+        version = self._ints[offset + _PLAYERS_VERSION] + 1
+        self._ints[offset:offset + record_size] = memoryview(bytes(8 * record_size)).cast("q")
+        self._ints[offset + _RENTS] = money_amount
+        for index, rent_amount in enumerate(rent_amounts_list, 1):
+            self._ints[offset + _RENTS + index] = rent_amount
+        for index in range(NUM_SPACES):
+            self._ints[offset + _OWNERS + index] = -1
+        self._ints[offset + _PLAYERS_VERSION] = version
+        self._players_version = version
+        self._player_slots = {}
+        self._player_names = []
+
+    def create_player(self, name, initial_balance):
+        """ Create player in the next free slot.
+
+        Args:
+            name (str): unique player name, at most NAME_SIZE bytes as UTF-8
+            initial_balance (int): account balance at start of game
+        Raises:
+            ValueError: if the game is full, the name is too long or the name
+                is already used
+        """
+        self.refresh_player_slots()
+        slot = self._ints[self._offset]
+        encoded_name = name.encode()
+        if name in self._player_slots:
+            raise ValueError("Player name already used: {}".format(name))
+        if slot == self._pool.get_max_players():
+            raise ValueError("No free player slot")
+        if len(encoded_name) > NAME_SIZE:
+            raise ValueError("Player name longer than {} bytes".format(NAME_SIZE))
+
+        name_bytes = self._pool.get_name_bytes(self._game_index, slot)
+        name_bytes[:] = encoded_name.ljust(NAME_SIZE, b"\0")
+        name_bytes.release()
+
+        balances = self._offset + _BALANCES
+        self._ints[balances + slot] = initial_balance
+        self._ints[balances + self._pool.get_max_players() + slot] = 0
+        self._ints[self._offset] = slot + 1
+        self._ints[self._offset + _PLAYERS_VERSION] += 1
+        self._players_version = self._ints[self._offset + _PLAYERS_VERSION]
+        self._player_slots[name] = slot
+        self._player_names.append(name)
+
+    def get_player_names(self):
+        """ Retrieve names of all players in slot order.
+
+        Returns:
+            list: player names
+        """
+        self.refresh_player_slots()
+        return list(self._player_names)
+
+    def get_player_account_balance(self, name):
+        """ Retrieve the player's account balance.
+
+        Args:
+            name (str): unique player name
+        Returns:
+            int: player's current account balance
+        """
+        self.refresh_player_slots()
+        return self._ints[self._offset + _BALANCES + self._player_slots[name]]
+
+    def get_player_current_position(self, name):
+        """ Retrieve the player's current position on the board.
+
+        Args:
+            name (str): unique player name
+        Returns:
+            int: player's current position on the board game
+        """
+        self.refresh_player_slots()
+        positions = self._offset + _BALANCES + self._pool.get_max_players()
+        return self._ints[positions + self._player_slots[name]]
+
+    def set_player_current_position(self, name, position_index):
+        """ Place player on a space without paying rent or GO money.
+
+        Args:
+            name (str): unique player name
+            position_index (int): index of space on board
+        """
+        self.refresh_player_slots()
+        positions = self._offset + _BALANCES + self._pool.get_max_players()
+        self._ints[positions + self._player_slots[name]] = position_index
+
+    def get_space_owner_name(self, space_index):
+        """ Retrieve the owner of a space.
+
+        Args:
+            space_index (int): index of space on board
+        Returns:
+            None: if space unowned
+            str: name of player who owns space, if owned
+        """
+        self.refresh_player_slots()
+        slot = self._ints[self._offset + _OWNERS + space_index]
+        if slot == -1:
+            return None
+        return self._player_names[slot]
+
+    def set_space_owner_name(self, space_index, name):
+        """ Set owner of a space without paying for it.
+
+        Args:
+            space_index (int): index of space on board
+            name (str): player name, or None for unowned
+        """
+        self.refresh_player_slots()
+        slot = -1 if name is None else self._player_slots[name]
+        self._ints[self._offset + _OWNERS + space_index] = slot
+
+    def buy_space(self, name):
+        """ Purchase space on board with player's account balance.
+
+        Args:
+            name (str): unique player name
+        Returns:
+            True: if player buys space
+            False: if player does not buy space
+        """
+        self.refresh_player_slots()
+        ints = self._ints
+        offset = self._offset
+        slot = self._player_slots[name]
+        balance_index = offset + _BALANCES + slot
+        position_index = ints[balance_index + self._pool.get_max_players()]
+        purchase_price = ints[offset + _RENTS + position_index] * 5
+
+        if (ints[balance_index] > purchase_price and position_index != 0
+                and ints[offset + _OWNERS + position_index] == -1):
+            ints[balance_index] -= purchase_price
+            ints[offset + _OWNERS + position_index] = slot
+            return True
+
+        return False
+
+    def move_player(self, name, num_spaces_to_move):
+        """ Move player a specified amount of spaces on board. Pay any rent owed.
+        Remove inactive player ownership of spaces.
+
+        Args:
+            name (str): unique player name
+            num_spaces_to_move (int): number of spaces to move, 0 to 25
+        Raises:
+            ValueError: if num_spaces_to_move is out of range
+        """
+        if not 0 <= num_spaces_to_move <= NUM_SPACES:
+            raise ValueError("Shared games move 0 to 25 spaces")
+
+        self.refresh_player_slots()
+        ints = self._ints
+        offset = self._offset
+        slot = self._player_slots[name]
+        balance_index = offset + _BALANCES + slot
+        balance = ints[balance_index]
+
+        # No movement when account balance is zero
+        if balance == 0:
+            return
+
+        position_index = ints[balance_index + self._pool.get_max_players()] + num_spaces_to_move
+        if position_index >= NUM_SPACES:
+            balance += ints[offset + _RENTS]
+            position_index -= NUM_SPACES
+        ints[balance_index + self._pool.get_max_players()] = position_index
+
+        # Pay rent on spaces owned by another player and not GO
+        owner_slot = ints[offset + _OWNERS + position_index]
+        if owner_slot != -1 and owner_slot != slot and position_index != 0:
+            rent_amount = min(ints[offset + _RENTS + position_index], balance)
+            balance -= rent_amount
+            ints[offset + _BALANCES + owner_slot] += rent_amount
+        ints[balance_index] = balance
+
+        # Remove ownership of spaces from inactive player
+        if balance == 0:
+            for owners_index in range(offset + _OWNERS, offset + _OWNERS + NUM_SPACES):
+                if ints[owners_index] == slot:
+                    ints[owners_index] = -1
+
+    def check_game_over(self):
+        """ Determine if game is over and return name of winner.
+
+        Returns:
+            str: name of winner, if game over
+            str: empty string, if game not over
+        """
+        self.refresh_player_slots()
+        balances = self._offset + _BALANCES
+        active_players = [name for name, slot in self._player_slots.items()
+                          if self._ints[balances + slot] > 0]
+        if len(active_players) == 1:
+            return active_players[0]
+        return ""
+
+    def to_game(self):
+        """ Copy the game out of shared memory.
+
+        Returns:
+            RealEstateGame: independent copy of game
+        """
+        self.refresh_player_slots()
+        game = RealEstateGame()
+        rents = self._ints[self._offset + _RENTS:self._offset + _OWNERS].tolist()
+        game.create_spaces(rents[0], rents[1:])
+
+        for name in self._player_slots:
+            game.create_player(name, self.get_player_account_balance(name))
+        players = {player.get_name(): player for player in game.get_players()}
+        for name, player in players.items():
+            player.set_position_index(self.get_player_current_position(name))
+
+        for space_index, space in enumerate(game.get_spaces()):
+            owner_name = self.get_space_owner_name(space_index)
+            if owner_name is not None:
+                space.set_owner_name(owner_name)
+                players[owner_name].set_spaces_owned(space)
+
+        return game
@@ -0,0 +1,79 @@
+""" Helpers for playing complete RealEstateGame games with reproducible dice. """
+
+from Dice import Dice
+from RealEstateGame import RealEstateGame
+
+RENT_AMOUNTS_LIST = [50, 50, 50, 100, 100, 100, 150, 150, 150, 200, 200, 200,
+                     250, 250, 250, 300, 300, 300, 350, 350, 350, 400, 400, 400]
+
+
+def new_game(seed, game_id, num_players=4, initial_balance=1000, money_amount=100,
+             rent_amounts_list=RENT_AMOUNTS_LIST, use_move_table=True):
+    """ Create a game with players named "0", "1", ... and dice keyed by
+    (seed, game_id).
+
+    Args:
+        seed (int): seed shared by every game in a simulation run
+        game_id (int): unique game id
+        num_players (int): number of players
+        initial_balance (int): account balance of each player
+        money_amount (int): amount paid to players when land or pass GO
+        rent_amounts_list (list): list of 24 rent amounts
+        use_move_table (bool): resolve moves from the precomputed move table
+    Returns:
+        RealEstateGame: new game
+    """
+    game = RealEstateGame(use_move_table)
+    game.create_spaces(money_amount, rent_amounts_list)
+    for index in range(num_players):
+        game.create_player(str(index), initial_balance)
+    game.set_dice(Dice(seed, game_id))
+    return game
+
+
+def play_turn(game, name, buy_policy=None):
+    """ Roll and move a player, then buy the space they land on.
+
+    Args:
+        game (RealEstateGame): game with dice set
+        name (str): unique player name
+        buy_policy (callable): buy_policy(game, name) returns True to buy;
+            always buys when None
+    """
+    game.move_player(name)
+    if buy_policy is None or buy_policy(game, name):
+        game.buy_space(name)
+
+
+def play_game(game, max_turns=1000, buy_policy=None):
+    """ Play players in creation order until one player is left. Players with
+    a balance of zero are skipped.
+
+    Args:
+        game (RealEstateGame): game with dice set
+        max_turns (int): most turns to play
+        buy_policy (callable): buy_policy(game, name) returns True to buy;
+            always buys when None
+    Returns:
+        tuple: (name of winner or empty string, number of turns played)
+    """
+    names = [player.get_name() for player in game.get_players()]
+    turns = 0
+
+    while turns < max_turns:
+        active_names = [name for name in names if game.get_player_account_balance(name) > 0]
+        if not active_names:
+            break
+
+        for name in active_names:
+            if game.get_player_account_balance(name) == 0:
+                continue
+
+            play_turn(game, name, buy_policy)
+            turns += 1
+
+            winner = game.check_game_over()
+            if winner or turns == max_turns:
+                return winner, turns
+
+    return "", turns
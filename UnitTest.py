@@ -2,8 +2,26 @@
 Test module for RealEstateGame
 """
 
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
 import unittest
+from BalanceHistory import BalanceHistory
+from Dice import Dice
+from EarlyTermination import (DominanceCriterion, OutcomeModel, OutcomeModelCriterion,
+                              fit_outcome_model, leader_features)
+from FuzzHarness import DifferentialFuzzer, format_reproducer, generate_case
+from GameStore import GameStore
+from Profiler import (compare_profiles, main as profiler_main, profile_workload,
+                      write_collapsed_stacks)
+from RealEstateEnv import BUY, SKIP, RealEstateEnv
 from RealEstateGame import RealEstateGame
+from RentOptimizer import RentOptimizer, evaluate_games
+from SharedGamePool import SharedGamePool
+from Simulation import new_game, play_game
 
 class TestRealEstateGame(unittest.TestCase):
     """ Represents tests for basic functionality of RealEstateGame module. """
@@ -572,3 +590,711 @@ class TestReadMeSpec(unittest.TestCase):
             self.assertEqual(0, self.game.get_player_account_balance(name))
 
         self.assertEqual("", self.game.check_game_over())
+
+
+class TestGameStore(unittest.TestCase):
+    """ Represents tests for saving and loading games with GameStore. """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.db")
+        self.store = GameStore(self.path)
+
+        self.game = RealEstateGame()
+        rent_list = [50, 50, 50, 100, 100, 100, 150, 150, 150, 200, 200, 200,
+                     250, 250, 250, 300, 300, 300, 350, 350, 350, 400, 400, 400]
+        self.game.create_spaces(100, rent_list)
+        self.game.create_player("Sandra", 1000)
+        self.game.create_player("Maria", 1000)
+
+    def tearDown(self) -> None:
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_save_clears_dirty_fields(self):
+        self.game.move_player("Sandra", 4)
+        self.store.save("game", self.game)
+
+        for player in self.game.get_players():
+            self.assertEqual(set(), player.get_dirty_fields())
+        for space in self.game.get_spaces():
+            self.assertEqual(set(), space.get_dirty_fields())
+
+    def test_setters_mark_dirty_fields(self):
+        self.store.save("game", self.game)
+
+        self.game.move_player("Sandra", 4)
+        self.assertEqual({"position_index"},
+                         self.game.get_players()[0].get_dirty_fields())
+
+        self.game.buy_space("Sandra")
+        self.assertEqual({"account_balance", "position_index"},
+                         self.game.get_players()[0].get_dirty_fields())
+        self.assertEqual({"owner_name"}, self.game.get_spaces()[4].get_dirty_fields())
+        self.assertEqual(set(), self.game.get_spaces()[5].get_dirty_fields())
+
+    def test_load_restores_game_after_restart(self):
+        self.store.save("game", self.game)
+        self.game.move_player("Sandra", 4)
+        self.game.buy_space("Sandra")
+        self.game.move_player("Maria", 4)
+        self.store.save("game", self.game)
+        self.store.close()
+
+        self.store = GameStore(self.path)
+        loaded = self.store.load("game")
+
+        self.assertEqual(600, loaded.get_player_account_balance("Sandra"))
+        self.assertEqual(900, loaded.get_player_account_balance("Maria"))
+        self.assertEqual(4, loaded.get_player_current_position("Maria"))
+        self.assertEqual("Sandra", loaded.get_spaces()[4].get_owner_name())
+        self.assertEqual(25, len(loaded.get_spaces()))
+        self.assertEqual(100, loaded.get_spaces()[0].get_rent_amount())
+
+        # Spaces owned are restored so bankruptcy releases them
+        self.assertEqual([loaded.get_spaces()[4]],
+                         loaded.get_players()[0].get_spaces_owned())
+
+    def test_buffered_saves_written_on_flush(self):
+        self.store.close()
+        self.store = GameStore(self.path, flush_interval=3600)
+        self.store.save("game", self.game)
+        self.game.move_player("Sandra", 3)
+        self.store.save("game", self.game)
+
+        reader = GameStore(self.path)
+        with self.assertRaises(KeyError):
+            reader.load("game")
+
+        self.store.flush()
+        self.assertEqual(3, reader.load("game").get_player_current_position("Sandra"))
+        reader.close()
+
+    def test_load_unknown_game(self):
+        with self.assertRaises(KeyError):
+            self.store.load("missing")
+
+    def test_loaded_game_saved_as_new_id(self):
+        self.game.move_player("Sandra", 4)
+        self.game.buy_space("Sandra")
+        self.store.save("g1", self.game)
+
+        loaded = self.store.load("g1")
+        loaded.move_player("Maria", 4)
+        self.store.save("g2", loaded)
+        copy = self.store.load("g2")
+
+        self.assertEqual(25, len(copy.get_spaces()))
+        self.assertEqual(600, copy.get_player_account_balance("Sandra"))
+        self.assertEqual(900, copy.get_player_account_balance("Maria"))
+        self.assertEqual(4, copy.get_player_current_position("Sandra"))
+        self.assertEqual("Sandra", copy.get_spaces()[4].get_owner_name())
+        self.assertEqual(4, self.store.load("g1").get_player_current_position("Sandra"))
+        self.assertEqual(0, self.store.load("g1").get_player_current_position("Maria"))
+
+    def test_saved_game_written_to_second_store(self):
+        self.game.move_player("Sandra", 4)
+        self.game.buy_space("Sandra")
+        self.store.save("g", self.game)
+
+        other = GameStore(os.path.join(self.directory.name, "other.db"))
+        other.save("g", self.game)
+        copy = other.load("g")
+        other.close()
+
+        self.assertEqual(25, len(copy.get_spaces()))
+        self.assertEqual(500, copy.get_player_account_balance("Sandra"))
+        self.assertEqual(4, copy.get_player_current_position("Sandra"))
+        self.assertEqual([copy.get_spaces()[4]], copy.get_players()[0].get_spaces_owned())
+
+
+class TestMoveTable(unittest.TestCase):
+    """ Represents tests for move resolution with the precomputed move table. """
+
+    def setUp(self) -> None:
+        self.rent_list = [50, 50, 50, 100, 100, 100, 150, 150, 150, 200, 200, 200,
+                          250, 250, 250, 300, 300, 300, 350, 350, 350, 400, 400, 400]
+        self.player_name = ["Sandra", "Maria", "Sue", "Sam"]
+
+    def create_game(self, use_move_table):
+        game = RealEstateGame(use_move_table)
+        game.create_spaces(100, self.rent_list)
+        for name in self.player_name:
+            game.create_player(name, 1500)
+        return game
+
+    def test_move_table_built_for_standard_board(self):
+        self.assertEqual(25 * 13, len(self.create_game(True)._move_table))
+        self.assertEqual([], self.create_game(False)._move_table)
+
+    def test_move_table_updated_when_space_bought(self):
+        game = self.create_game(True)
+        game.move_player("Sandra", 4)
+        game.buy_space("Sandra")
+
+        # Rolling 3 from space 1 lands on space 4
+        self.assertEqual((4, None, 100, "Sandra"), game._move_table[1 * 13 + 3])
+        # Rolling 9 from space 20 passes GO and lands on space 4
+        self.assertEqual((4, 100, 100, "Sandra"), game._move_table[20 * 13 + 9])
+
+    def test_move_table_matches_helper_methods(self):
+        rng = random.Random(26)
+        table_game = self.create_game(True)
+        helper_game = self.create_game(False)
+
+        for _ in range(2000):
+            name = rng.choice(self.player_name)
+            roll = rng.randint(0, 15)
+            for game in (table_game, helper_game):
+                game.move_player(name, roll)
+                game.buy_space(name)
+
+            for index, space in enumerate(helper_game.get_spaces()):
+                self.assertEqual(space.get_owner_name(),
+                                 table_game.get_spaces()[index].get_owner_name())
+            for name in self.player_name:
+                self.assertEqual(helper_game.get_player_account_balance(name),
+                                 table_game.get_player_account_balance(name))
+                self.assertEqual(helper_game.get_player_current_position(name),
+                                 table_game.get_player_current_position(name))
+
+
+class TestDice(unittest.TestCase):
+    """ Represents tests for reproducible dice. """
+
+    def test_roll_depends_only_on_seed_game_and_turn(self):
+        dice = Dice(7, "game-1")
+        rolls = [dice.next_roll() for _ in range(100)]
+
+        # Rolls drawn out of order from a new instance match
+        other = Dice(7, "game-1")
+        for turn in reversed(range(100)):
+            self.assertEqual(rolls[turn], other.roll(turn))
+
+        self.assertNotEqual(rolls, [Dice(7, "game-2").roll(turn) for turn in range(100)])
+        self.assertNotEqual(rolls, [Dice(8, "game-1").roll(turn) for turn in range(100)])
+
+    def test_rolls_within_range(self):
+        one_die = Dice(0, 0).roll_buffer(0, 1000)
+        self.assertEqual(set(range(1, 7)), set(one_die))
+
+        two_dice = Dice(0, 0, num_dice=2).roll_buffer(0, 1000)
+        self.assertEqual(set(range(2, 13)), set(two_dice))
+
+    def test_roll_buffer_matches_roll(self):
+        dice = Dice(3, "game", num_dice=2)
+        buffer = dice.roll_buffer(5, 40)
+        self.assertEqual([dice.roll(turn) for turn in range(5, 45)], list(buffer))
+
+    def test_move_player_rolls_dice(self):
+        game = RealEstateGame()
+        game.create_spaces(100, [10] * 24)
+        game.create_player("Sandra", 1000)
+
+        with self.assertRaises(ValueError):
+            game.move_player("Sandra")
+
+        game.set_dice(Dice(1, "game"))
+        game.move_player("Sandra")
+        self.assertEqual(Dice(1, "game").roll(0), game.get_player_current_position("Sandra"))
+
+
+class TestBalanceHistory(unittest.TestCase):
+    """ Represents tests for recording balances over time. """
+
+    def setUp(self) -> None:
+        rng = random.Random(29)
+        self.balances = [1000]
+        for _ in range(1000):
+            self.balances.append(self.balances[-1] + rng.choice([0, 0, 100, -50, -400]))
+
+    def test_random_access_matches_appended_balances(self):
+        for delta_of_delta in (False, True):
+            history = BalanceHistory(keyframe_interval=16, delta_of_delta=delta_of_delta)
+            for balance in self.balances:
+                history.append(balance)
+
+            self.assertEqual(len(self.balances), len(history))
+            self.assertEqual(self.balances, list(history))
+            for turn in (0, 1, 15, 16, 17, 500, 1000, -1):
+                self.assertEqual(self.balances[turn], history[turn])
+            with self.assertRaises(IndexError):
+                history[len(self.balances)]
+
+    def test_large_balance_changes_recorded(self):
+        balances = [1000, 2 ** 31 + 1000, 5, 2 ** 40, 2 ** 40 - 2 ** 33, 2 ** 70, 0, 3]
+        for delta_of_delta in (False, True):
+            history = BalanceHistory(keyframe_interval=3, delta_of_delta=delta_of_delta)
+            for balance in balances:
+                history.append(balance)
+
+            self.assertEqual(balances, list(history))
+            self.assertEqual(balances, [history[turn] for turn in range(len(balances))])
+
+    def test_game_records_balance_after_each_move(self):
+        game = RealEstateGame()
+        game.create_spaces(100, [50] * 24)
+        game.create_player("Sandra", 1000)
+        game.create_player("Maria", 1000)
+
+        with self.assertRaises(ValueError):
+            game.balance_history("Sandra")
+
+        game.enable_balance_history(keyframe_interval=2)
+        game.move_player("Sandra", 3)
+        game.buy_space("Sandra")
+        game.move_player("Maria", 3)
+        game.create_player("Sue", 500)
+        game.move_player("Sue", 20)
+
+        self.assertEqual([1000, 1000, 800, 800], list(game.balance_history("Sandra")))
+        self.assertEqual([1000, 1000, 950, 950], list(game.balance_history("Maria")))
+        self.assertEqual([500, 500, 500, 500], list(game.balance_history("Sue")))
+
+
+class TestSimulation(unittest.TestCase):
+    """ Represents tests for playing complete games. """
+
+    def test_play_game_is_reproducible(self):
+        first = play_game(new_game(5, 1))
+        second = play_game(new_game(5, 1))
+        self.assertEqual(first, second)
+        self.assertNotEqual("", first[0])
+
+    def test_play_game_stops_at_max_turns(self):
+        game = new_game(5, 1, initial_balance=10 ** 6)
+        self.assertEqual(("", 30), play_game(game, max_turns=30))
+
+
+class TestProfiler(unittest.TestCase):
+    """ Represents tests for attributing simulation time to rule phases. """
+
+    def test_profile_workload_attributes_phases(self):
+        profile = profile_workload(num_games=5, max_turns=200)
+
+        self.assertGreater(profile["turns"], 0)
+        for phase in ("dice", "movement", "go_payout", "rent", "purchase",
+                      "bankruptcy", "game_over"):
+            self.assertIn(phase, profile["phases"])
+        self.assertLess(sum(profile["phases"].values()), profile["total_seconds"])
+
+        # Stack widths add up to the phase totals
+        for phase, seconds in profile["phases"].items():
+            stack_total = sum(count for stack, count in profile["stacks"].items()
+                              if stack.split(";")[1] == phase)
+            self.assertAlmostEqual(seconds * 1e6, stack_total, delta=10)
+
+    def test_write_collapsed_stacks(self):
+        profile = {"stacks": {"workload;rent;pay_rent": 12, "workload;dice;next_roll": 0}}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stacks.txt")
+            write_collapsed_stacks(profile, path)
+            with open(path) as file:
+                self.assertEqual("workload;rent;pay_rent 12\n", file.read())
+
+    def test_compare_profiles_flags_regressions(self):
+        baseline = {"turns": 100, "phases": {"rent": 0.001, "movement": 0.002}}
+        candidate = {"turns": 200, "phases": {"rent": 0.004, "movement": 0.004,
+                                              "purchase": 0.001}}
+
+        regressions = compare_profiles(baseline, candidate, threshold=0.1)
+        self.assertEqual(["rent", "purchase"], [phase for phase, _, _ in regressions])
+        self.assertEqual((10.0, 20.0), regressions[0][1:])
+
+    def test_compare_profiles_rejects_different_modes(self):
+        baseline = {"mode": "cprofile", "turns": 100, "phases": {"rent": 0.002}}
+        candidate = {"mode": "sample", "turns": 100, "phases": {"rent": 0.001}}
+
+        with self.assertRaises(ValueError):
+            compare_profiles(baseline, candidate)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for profile in (baseline, candidate):
+                paths.append(os.path.join(directory, "{}.json".format(profile["mode"])))
+                with open(paths[-1], "w") as file:
+                    json.dump(profile, file)
+            with self.assertRaises(SystemExit) as context:
+                profiler_main(["compare"] + paths)
+            self.assertNotEqual(0, context.exception.code)
+
+
+class TestSharedGamePool(unittest.TestCase):
+    """ Represents tests for games stored in shared memory. """
+
+    def setUp(self) -> None:
+        self.pool = SharedGamePool.create(3, max_players=4)
+        self.game = new_game(31, 0, use_move_table=False)
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.pool.unlink()
+
+    def test_store_game_copies_state(self):
+        self.game.move_player("0", 4)
+        self.game.buy_space("0")
+        self.game.move_player("1", 9)
+        view = self.pool.store_game(1, self.game)
+
+        self.assertEqual(["0", "1", "2", "3"], view.get_player_names())
+        self.assertEqual(500, view.get_player_account_balance("0"))
+        self.assertEqual(9, view.get_player_current_position("1"))
+        self.assertEqual("0", view.get_space_owner_name(4))
+        self.assertIsNone(view.get_space_owner_name(5))
+
+        copy = view.to_game()
+        self.assertEqual(500, copy.get_player_account_balance("0"))
+        self.assertEqual([copy.get_spaces()[4]], copy.get_players()[0].get_spaces_owned())
+
+    def test_attached_pool_sees_writes_in_place(self):
+        writer = self.pool.store_game(2, self.game)
+        reader_pool = SharedGamePool.attach(self.pool.get_name())
+        reader = reader_pool.view(2)
+
+        self.assertEqual(3, reader_pool.get_num_games())
+        writer.move_player("2", 6)
+        self.assertEqual(6, reader.get_player_current_position("2"))
+        self.assertTrue(writer.buy_space("2"))
+        self.assertEqual("2", reader.get_space_owner_name(6))
+
+        reader_pool.close()
+
+    def test_pool_survives_reader_process(self):
+        writer = self.pool.store_game(0, self.game)
+        script = ("from SharedGamePool import SharedGamePool\n"
+                  "pool = SharedGamePool.attach({!r})\n"
+                  "pool.view(0).move_player('1', 5)\n"
+                  "pool.close()\n").format(self.pool.get_name())
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertNotIn("leaked", result.stderr)
+        self.assertEqual(5, writer.get_player_current_position("1"))
+        reader_pool = SharedGamePool.attach(self.pool.get_name())
+        self.assertEqual(5, reader_pool.view(0).get_player_current_position("1"))
+        reader_pool.close()
+
+    def test_view_sees_players_of_replaced_game(self):
+        reader = self.pool.view(1)
+        self.assertEqual([], reader.get_player_names())
+
+        self.pool.store_game(1, self.game)
+        self.assertEqual(["0", "1", "2", "3"], reader.get_player_names())
+        self.assertEqual(1000, reader.get_player_account_balance("3"))
+
+        writer = self.pool.view(1)
+        writer.create_spaces(100, [50] * 24)
+        writer.create_player("A", 700)
+        writer.create_player("B", 800)
+        writer.move_player("B", 2)
+        writer.buy_space("B")
+        self.assertEqual(["A", "B"], reader.get_player_names())
+        self.assertEqual("B", reader.get_space_owner_name(2))
+        with self.assertRaises(KeyError):
+            reader.get_player_account_balance("3")
+
+    def test_view_matches_game(self):
+        view = self.pool.store_game(0, self.game)
+        rng = random.Random(31)
+
+        for _ in range(3000):
+            name = rng.choice(["0", "1", "2", "3"])
+            roll = rng.randint(0, 12)
+            for engine in (self.game, view):
+                engine.move_player(name, roll)
+                engine.buy_space(name)
+            self.assertEqual(self.game.check_game_over(), view.check_game_over())
+
+            for name in view.get_player_names():
+                self.assertEqual(self.game.get_player_account_balance(name),
+                                 view.get_player_account_balance(name))
+            for index, space in enumerate(self.game.get_spaces()):
+                self.assertEqual(space.get_owner_name(), view.get_space_owner_name(index))
+
+    def test_full_game_rejects_player(self):
+        view = self.pool.store_game(0, self.game)
+        with self.assertRaises(ValueError):
+            view.create_player("4", 1000)
+
+    def test_duplicate_player_name_rejected(self):
+        view = self.pool.view(0)
+        view.create_spaces(100, [50] * 24)
+        view.create_player("A", 1000)
+        with self.assertRaises(ValueError):
+            view.create_player("A", 1000)
+
+        view.create_player("B", 1000)
+        view.move_player("B", 3)
+        self.assertTrue(view.buy_space("B"))
+        self.assertEqual("B", view.get_space_owner_name(3))
+        self.assertEqual(["A", "B"], view.get_player_names())
+
+
+class TestRealEstateEnv(unittest.TestCase):
+    """ Represents tests for the vectorized self-play environment. """
+
+    def test_reset_fills_observations(self):
+        env = RealEstateEnv(3, num_players=2, seed=32)
+        observations = env.reset()
+
+        self.assertEqual(3 * env.obs_size, len(observations))
+        for env_index in range(3):
+            start = env_index * env.obs_size
+            # Player 0 decides after the first move
+            self.assertEqual(0, observations[start])
+            self.assertEqual([1000, 1000], list(observations[start + 1:start + 3]))
+            self.assertEqual(0, observations[start + 4])
+            # Every space is unowned
+            owners = observations[start + 5:start + env.obs_size]
+            self.assertEqual(25, sum(owners))
+            self.assertEqual([1] * 25, list(owners[::3]))
+
+    def test_step_updates_buffers_in_place(self):
+        env = RealEstateEnv(2, num_players=2, seed=32)
+        observations = env.reset()
+        position = observations[3]
+
+        result = env.step([BUY, SKIP])
+        self.assertIs(observations, result[0])
+        self.assertEqual(1, observations[0])
+        # Player 0 bought the space they were on
+        self.assertEqual(1, observations[5 + position * 3 + 1])
+        self.assertEqual([0, 0], list(result[2]))
+
+    def test_finished_games_reset_with_reproducible_results(self):
+        infos_by_run = []
+        for _ in range(2):
+            env = RealEstateEnv(4, num_players=2, seed=32, max_turns=400)
+            env.reset()
+            finished = []
+            for _ in range(600):
+                _, rewards, dones, infos = env.step([BUY] * 4)
+                for env_index in range(4):
+                    if dones[env_index]:
+                        finished.append((env_index, infos[env_index]["winner"],
+                                         rewards[env_index]))
+                        self.assertIn(rewards[env_index], (-1.0, 0.0, 1.0))
+            infos_by_run.append(finished)
+
+        self.assertEqual(infos_by_run[0], infos_by_run[1])
+        self.assertGreater(len(infos_by_run[0]), 4)
+
+    def test_step_matches_real_estate_game(self):
+        env = RealEstateEnv(1, num_players=3, seed=32, initial_balance=600)
+        observations = env.reset()
+        game = new_game(32, "0:0", num_players=3, initial_balance=600)
+        game.move_player("0")
+        rng = random.Random(32)
+
+        for _ in range(2000):
+            slot = observations[0]
+            action = rng.choice([BUY, SKIP])
+            _, rewards, dones, infos = env.step([action])
+            if action == BUY:
+                game.buy_space(str(slot))
+            for _ in range(3):
+                slot = (slot + 1) % 3
+                if game.get_player_account_balance(str(slot)) > 0:
+                    break
+            game.move_player(str(slot))
+
+            winner = game.check_game_over()
+            if dones[0]:
+                self.assertEqual(winner, infos[0]["winner"])
+                break
+            self.assertEqual("", winner)
+            self.assertEqual(slot, observations[0])
+            for index, player in enumerate(game.get_players()):
+                self.assertEqual(player.get_account_balance(), observations[1 + index])
+                self.assertEqual(player.get_position_index(), observations[4 + index])
+            for index, space in enumerate(game.get_spaces()):
+                owner_name = space.get_owner_name()
+                one_hot = [0] * 4
+                one_hot[0 if owner_name is None else int(owner_name) + 1] = 1
+                self.assertEqual(one_hot, list(observations[7 + 4 * index:11 + 4 * index]))
+        else:
+            self.fail("game did not finish")
+
+
+class TestRentOptimizer(unittest.TestCase):
+    """ Represents tests for searching rent tables. """
+
+    def setUp(self) -> None:
+        self.options = {"num_games": 8, "population_size": 6, "max_turns": 300,
+                        "target_turns": 150, "seed": 33}
+
+    def test_candidates_share_dice_streams(self):
+        game_options = {"num_players": 4, "initial_balance": 1000, "money_amount": 100}
+        first = evaluate_games([100] * 24, [0, 1, 2], 33, game_options, 300)
+        second = evaluate_games([100] * 24, [0, 1, 2], 33, game_options, 300)
+        self.assertEqual(first, second)
+
+    def test_loss_is_zero_when_targets_met(self):
+        optimizer = RentOptimizer(**self.options)
+        results = [("0", 150), ("1", 100), ("2", 200), ("3", 150)]
+        self.assertEqual(0.0, optimizer.loss(results))
+        self.assertGreater(optimizer.loss([("0", 150)] * 4), 0.0)
+
+    def test_racing_drops_losing_candidates(self):
+        optimizer = RentOptimizer(**self.options)
+        ranked = optimizer.evaluate_population()
+
+        self.assertEqual(2, len(ranked))
+        self.assertLessEqual(ranked[0][0], ranked[1][0])
+        played = sorted(len(results) for results in optimizer._results_cache.values())
+        self.assertEqual([2, 2, 2, 4, 8, 8], played)
+
+    def test_optimize_is_reproducible_and_improves(self):
+        first = RentOptimizer(**self.options).optimize(generations=3)
+        second = RentOptimizer(**self.options).optimize(generations=3)
+        self.assertEqual(first, second)
+
+        rents, loss = first
+        self.assertEqual(24, len(rents))
+        base = RentOptimizer(**dict(self.options, population_size=1))
+        self.assertLessEqual(loss, base.evaluate_population()[0][0])
+
+
+class TestEarlyTermination(unittest.TestCase):
+    """ Represents tests for ending games once the winner is clear. """
+
+    def setUp(self) -> None:
+        self.game = RealEstateGame()
+        self.game.create_spaces(100, [100] * 24)
+        self.game.create_player("Sandra", 5000)
+        self.game.create_player("Maria", 500)
+
+        # Sandra buys 4 spaces
+        for _ in range(4):
+            self.game.move_player("Sandra", 1)
+            self.game.buy_space("Sandra")
+
+    def test_game_over_reason_bankruptcy(self):
+        self.assertEqual("", self.game.get_game_over_reason())
+        self.game._players_in_game["Maria"].set_account_balance(-500)
+        self.assertEqual("Sandra", self.game.check_game_over())
+        self.assertEqual("bankruptcy", self.game.get_game_over_reason())
+
+    def test_leader_features(self):
+        leader, features = leader_features(self.game)
+        self.assertEqual("Sandra", leader)
+        # Sandra's net worth is 3000 + 2000 of spaces
+        self.assertEqual([1.0, 5000 / 5500, 1.0, 0.5], features)
+
+    def test_dominance_criterion_declares_leader(self):
+        self.game.set_early_termination(DominanceCriterion(0.95, 0.8))
+        self.assertEqual("", self.game.check_game_over())
+
+        self.game.set_early_termination(DominanceCriterion(0.9, 0.8))
+        self.assertEqual("Sandra", self.game.check_game_over())
+        self.assertEqual("early_termination", self.game.get_game_over_reason())
+
+    def test_criterion_checked_every_check_interval(self):
+        self.game.set_early_termination(DominanceCriterion(0.9, 0.8), check_interval=3)
+        self.assertEqual("", self.game.check_game_over())
+        self.assertEqual("", self.game.check_game_over())
+        self.assertEqual("Sandra", self.game.check_game_over())
+
+    def test_early_termination_winner_sticks(self):
+        self.game.set_early_termination(DominanceCriterion(0.9, 0.8), check_interval=2)
+        results = [self.game.check_game_over() for _ in range(4)]
+
+        self.assertEqual(["", "Sandra", "Sandra", "Sandra"], results)
+        self.assertEqual("early_termination", self.game.get_game_over_reason())
+
+    def test_set_early_termination_resets_checks(self):
+        self.game.set_early_termination(DominanceCriterion(0.95, 0.8), check_interval=2)
+        self.game.check_game_over()
+
+        self.game.set_early_termination(DominanceCriterion(0.9, 0.8), check_interval=2)
+        self.assertEqual("", self.game.check_game_over())
+        self.assertEqual("Sandra", self.game.check_game_over())
+
+        self.game.set_early_termination(None)
+        self.assertEqual("", self.game.get_game_over_reason())
+        self.assertEqual("", self.game.check_game_over())
+
+    def test_criterion_not_checked_without_active_players(self):
+        empty_game = RealEstateGame()
+        empty_game.create_spaces(100, [100] * 24)
+        empty_game.set_early_termination(DominanceCriterion())
+        self.assertEqual("", empty_game.check_game_over())
+
+        empty_game.create_player("Sandra", 0)
+        empty_game.create_player("Maria", 0)
+        self.assertEqual("", empty_game.check_game_over())
+        self.assertEqual("", empty_game.get_game_over_reason())
+
+    def test_outcome_model_criterion_uses_threshold(self):
+        model = OutcomeModel([0.0, 2.0, 0.0, 0.0])
+        probability = model.predict(leader_features(self.game)[1])
+
+        self.game.set_early_termination(OutcomeModelCriterion(model, probability + 0.01))
+        self.assertEqual("", self.game.check_game_over())
+        self.game.set_early_termination(OutcomeModelCriterion(model, probability))
+        self.assertEqual("Sandra", self.game.check_game_over())
+
+    def test_fitted_model_favours_dominant_leader(self):
+        model = fit_outcome_model(num_games=20, epochs=50)
+        self.assertGreater(model.predict([1.0, 0.9, 0.9, 0.5]),
+                           model.predict([1.0, 0.3, 0.3, 0.5]))
+
+    def test_early_termination_shortens_game_with_same_dice(self):
+        _, full_turns = play_game(new_game(34, 0))
+
+        game = new_game(34, 0)
+        game.set_early_termination(DominanceCriterion(0.6, 0.6))
+        winner, turns = play_game(game)
+
+        self.assertEqual("early_termination", game.get_game_over_reason())
+        self.assertLess(turns, full_turns)
+        self.assertNotEqual("", winner)
+
+
+class EqualBalancePurchaseGame(RealEstateGame):
+    """ Represents an engine that wrongly allows buying with a balance equal
+    to the purchase price.
+    """
+
+    def buy_space(self, name):
+        player = self._players_in_game[name]
+        space = self._game_spaces[player.get_position_index()]
+        if player.get_account_balance() == space.get_purchase_price():
+            player.set_account_balance(1)
+        return super().buy_space(name)
+
+
+class TestFuzzHarness(unittest.TestCase):
+    """ Represents tests for differential fuzzing of game engines. """
+
+    def setUp(self) -> None:
+        self.fuzzer = DifferentialFuzzer(seed=35, num_commands=60)
+
+    def tearDown(self) -> None:
+        self.fuzzer.close()
+
+    def test_generate_case_is_reproducible(self):
+        case = generate_case(random.Random(1), 50)
+        self.assertEqual(case, generate_case(random.Random(1), 50))
+        self.assertEqual(50, len(case["commands"]))
+        self.assertEqual(24, len(case["rent_amounts_list"]))
+
+    def test_engines_match_reference(self):
+        self.assertEqual([], self.fuzzer.run(200))
+
+    def test_divergence_shrunk_to_minimal_case(self):
+        self.fuzzer.add_engine("equal_balance", EqualBalancePurchaseGame)
+        divergences = self.fuzzer.run(200)
+
+        self.assertEqual(["equal_balance"], [divergence[0] for divergence in divergences])
+        _, case, index, expected, actual = divergences[0]
+        # Move onto a space, then buy it with a balance equal to its price
+        self.assertEqual(2, len(case["commands"]))
+        self.assertEqual("buy", case["commands"][-1][0])
+        self.assertEqual(1, index)
+        self.assertFalse(expected[0])
+        self.assertTrue(actual[0])
+
+        reproducer = format_reproducer(case)
+        self.assertTrue(reproducer.startswith("game = RealEstateGame()"))
+        self.assertIn("game.buy_space", reproducer)